@@ -1,6 +1,7 @@
 from django.contrib import admin
+from django.utils import timezone
 
-from .models import Category, Location, Post
+from .models import Category, Location, Post, Task
 
 
 admin.site.empty_value_display = 'Не задано'
@@ -54,7 +55,52 @@ class PostAdmin(admin.ModelAdmin):
         'location',
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Ищет по заголовку и тексту через индекс FTS5 вместо LIKE."""
+        if not search_term.strip():
+            return queryset, False
+        found = Post.objects.search(search_term).values('pk')
+        return queryset.filter(pk__in=found), False
+
+
+class TaskAdmin(admin.ModelAdmin):
+    """Кастомный интерфейс админ-зоны для фоновых задач."""
+
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_after',
+        'finished_at',
+        'created_at'
+    )
+    list_filter = (
+        'status',
+        'name',
+    )
+    readonly_fields = (
+        'name',
+        'payload',
+        'attempts',
+        'last_error',
+        'created_at',
+        'started_at',
+        'finished_at'
+    )
+    actions = ('retry',)
+
+    @admin.action(description='Повторить выбранные задачи')
+    def retry(self, request, queryset):
+        updated = queryset.retryable().update(
+            status=Task.Status.PENDING,
+            attempts=0,
+            run_after=timezone.now(),
+            finished_at=None
+        )
+        self.message_user(request, f'Задач поставлено в очередь: {updated}.')
+
 
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Post, PostAdmin)
+admin.site.register(Task, TaskAdmin)
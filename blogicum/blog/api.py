@@ -0,0 +1,206 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.generic import View
+
+from .models import Category, Comment, User
+from .paginators import InvalidCursor, ValuesCursorPaginator
+from .serializers import (
+    CategorySerializer, CommentSerializer, InvalidFields, PostCardSerializer,
+    PostSerializer, ProfileSerializer
+)
+from .views import PostQuerySetMixin
+
+
+class ApiError(Exception):
+    """Ошибка в параметрах запроса к API."""
+
+    pass
+
+
+def json_response(data, status=200):
+    return JsonResponse(
+        data,
+        status=status,
+        encoder=DjangoJSONEncoder,
+        json_dumps_params={'ensure_ascii': False}
+    )
+
+
+class ApiView(View):
+    """
+    Базовое представление JSON API.
+
+    Параметр fields задаёт поля ресурса через запятую, fields[author],
+    fields[category] и fields[location] — поля вложенных объектов.
+    Ошибки возвращаются в виде {"detail": "..."}.
+    """
+
+    http_method_names = ['get', 'head', 'options']
+    serializer_class = PostCardSerializer
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except Http404 as error:
+            return json_response(
+                {'detail': str(error) or 'Не найдено.'}, status=404
+            )
+        except (ApiError, InvalidCursor, InvalidFields) as error:
+            return json_response({'detail': str(error)}, status=400)
+
+    def get_serializer(self):
+        fields, embedded_fields = None, {}
+        for key, value in self.request.GET.items():
+            names = [name for name in value.split(',') if name]
+            if key == 'fields':
+                fields = names
+            elif key.startswith('fields[') and key.endswith(']'):
+                embedded_fields[key[7:-1]] = names
+        return self.serializer_class(fields, embedded_fields)
+
+
+class DetailApiView(ApiView):
+    """Один ресурс: первая строка get_queryset()."""
+
+    not_found_message = 'Не найдено.'
+
+    def get_queryset(self):
+        raise NotImplementedError(
+            'Определите get_queryset() в дочернем классе.'
+        )
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        row = self.get_queryset().values(*serializer.lookups()).first()
+        if row is None:
+            raise Http404(self.not_found_message)
+        return json_response(serializer.to_dict(row))
+
+
+class ListApiView(ApiView):
+    """Список ресурсов с курсорной пагинацией."""
+
+    ordering_field = 'pub_date'
+    descending = True
+
+    def get_queryset(self):
+        raise NotImplementedError(
+            'Определите get_queryset() в дочернем классе.'
+        )
+
+    def get_page_size(self):
+        try:
+            limit = int(self.request.GET.get('limit', settings.PAGE_SIZE))
+        except ValueError:
+            raise ApiError('Параметр limit должен быть числом.')
+        if not 1 <= limit <= settings.API_MAX_PAGE_SIZE:
+            raise ApiError(
+                f'Параметр limit должен быть от 1 до '
+                f'{settings.API_MAX_PAGE_SIZE}.'
+            )
+        return limit
+
+    def page_url(self, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query['cursor'] = cursor
+        return f'{self.request.path}?{query.urlencode()}'
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        rows = self.get_queryset().values(
+            *{*serializer.lookups(), self.ordering_field}
+        )
+        page = ValuesCursorPaginator(
+            rows, self.get_page_size(), self.ordering_field, self.descending
+        ).page(request.GET.get('cursor'))
+        return json_response({
+            'results': serializer.serialize(page),
+            'next': self.page_url(page.next_cursor),
+            'previous': self.page_url(page.previous_cursor),
+        })
+
+
+class PostListApiView(PostQuerySetMixin, ListApiView):
+    """Опубликованные посты, как на главной странице."""
+
+    def get_queryset(self):
+        return self.get_pub_queryset()
+
+
+class CategoryApiView(DetailApiView):
+    """Опубликованная категория."""
+
+    serializer_class = CategorySerializer
+    not_found_message = 'Категория не найдена.'
+
+    def get_queryset(self):
+        return Category.objects.filter(
+            slug=self.kwargs['category_slug'], is_published=True
+        )
+
+
+class CategoryPostsApiView(PostQuerySetMixin, ListApiView):
+    """Опубликованные посты опубликованной категории."""
+
+    def get_queryset(self):
+        category = get_object_or_404(
+            Category, slug=self.kwargs['category_slug'], is_published=True
+        )
+        return self.get_pub_queryset().filter(category=category)
+
+
+class ProfileApiView(DetailApiView):
+    """Профиль пользователя."""
+
+    serializer_class = ProfileSerializer
+    not_found_message = 'Пользователь не найден.'
+
+    def get_queryset(self):
+        return User.objects.filter(username=self.kwargs['username'])
+
+
+class ProfilePostsApiView(PostQuerySetMixin, ListApiView):
+    """Посты пользователя; автор видит и неопубликованные."""
+
+    def get_queryset(self):
+        author = get_object_or_404(User, username=self.kwargs['username'])
+        if author != self.request.user:
+            return self.get_pub_queryset().filter(author=author)
+        return self.get_base_queryset().filter(author=author)
+
+
+class PostVisibilityMixin(PostQuerySetMixin):
+    """Пост виден всем, если опубликован, а автору — всегда."""
+
+    def get_visible_posts(self):
+        posts = self.get_pub_queryset()
+        if self.request.user.is_authenticated:
+            posts |= self.get_base_queryset().filter(author=self.request.user)
+        return posts.filter(pk=self.kwargs['post_id'])
+
+
+class PostDetailApiView(PostVisibilityMixin, DetailApiView):
+    """Пост с полным текстом."""
+
+    serializer_class = PostSerializer
+    not_found_message = 'Публикация не найдена.'
+
+    def get_queryset(self):
+        return self.get_visible_posts()
+
+
+class CommentListApiView(PostVisibilityMixin, ListApiView):
+    """Комментарии поста в порядке добавления."""
+
+    serializer_class = CommentSerializer
+    ordering_field = 'created_at'
+    descending = False
+
+    def get_queryset(self):
+        if not self.get_visible_posts().exists():
+            raise Http404('Публикация не найдена.')
+        return Comment.objects.filter(post_id=self.kwargs['post_id'])
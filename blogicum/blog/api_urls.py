@@ -0,0 +1,29 @@
+from django.urls import path
+
+from . import api
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/',
+         api.PostListApiView.as_view(),
+         name='post_list'),
+    path('posts/<int:post_id>/',
+         api.PostDetailApiView.as_view(),
+         name='post_detail'),
+    path('posts/<int:post_id>/comments/',
+         api.CommentListApiView.as_view(),
+         name='comment_list'),
+    path('category/<slug:category_slug>/',
+         api.CategoryApiView.as_view(),
+         name='category'),
+    path('category/<slug:category_slug>/posts/',
+         api.CategoryPostsApiView.as_view(),
+         name='category_posts'),
+    path('profile/<str:username>/',
+         api.ProfileApiView.as_view(),
+         name='profile'),
+    path('profile/<str:username>/posts/',
+         api.ProfilePostsApiView.as_view(),
+         name='profile_posts'),
+]
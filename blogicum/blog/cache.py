@@ -0,0 +1,85 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import publication_cutoff
+
+SCOPE_VERSION_KEY = 'blog:scope:{}'
+PAGE_KEY = 'blog:page:{}'
+
+INDEX_SCOPE = 'index'
+
+
+def category_scope(slug):
+    return f'category:{slug}'
+
+
+def author_scope(username):
+    return f'author:{username}'
+
+
+def post_scopes(category_slug, author_username):
+    """Области кэша, в которых отображается карточка поста."""
+    scopes = {INDEX_SCOPE, author_scope(author_username)}
+    if category_slug:
+        scopes.add(category_scope(category_slug))
+    return scopes
+
+
+def bump_scopes(scopes):
+    """Делает недействительными закэшированные страницы областей."""
+    version = time.time_ns()
+    cache.set_many(
+        {SCOPE_VERSION_KEY.format(scope): version for scope in scopes},
+        timeout=None
+    )
+
+
+def get_scope_versions(scopes):
+    """
+    Возвращает версии областей кэша.
+    Отсутствующие в кэше версии создаются заново, поэтому после
+    вытеснения ключа старые страницы не будут использованы.
+    """
+    keys = [SCOPE_VERSION_KEY.format(scope) for scope in sorted(scopes)]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def page_cache_key(request, scopes):
+    """Ключ страницы: адрес, курсор, версии областей и интервал времени."""
+    parts = [
+        request.get_full_path(),
+        publication_cutoff().isoformat(),
+        *map(str, get_scope_versions(scopes)),
+    ]
+    digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return PAGE_KEY.format(digest)
+
+
+def has_session_cookie(request):
+    """
+    Без cookie сессии пользователь не может быть авторизован.
+    Проверка не обращается к базе данных.
+    """
+    return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def is_page_cacheable(request, anonymous=None):
+    """
+    anonymous=True передаётся, когда анонимность уже известна,
+    например по has_session_cookie().
+    """
+    if anonymous is None:
+        anonymous = not request.user.is_authenticated
+    return bool(
+        settings.PAGE_CACHE_TIMEOUT
+        and request.method in ('GET', 'HEAD')
+        and anonymous
+    )
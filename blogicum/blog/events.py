@@ -0,0 +1,204 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.urls import Resolver404, resolve
+
+from .models import Post
+
+# Пометка в очереди подписчика: поток нужно закрыть.
+CLOSE = None
+
+
+def post_channel(post_id):
+    return f'post:{post_id}'
+
+
+def format_event(event, data, event_id=None):
+    """Сообщение в формате text/event-stream; каждая строка data отдельно."""
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.extend(f'data: {line}' for line in str(data).splitlines() or [''])
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+class Subscription:
+    """
+    Очередь сообщений одного клиента ограниченного размера.
+    Клиент, который не успевает читать поток, отключается:
+    очередь очищается и в неё кладётся CLOSE.
+    """
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def put(self, message):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(CLOSE)
+
+
+class Broker:
+    """
+    Рассылка сообщений подписчикам внутри процесса.
+    publish() можно вызывать из любого потока: сообщение передаётся
+    в цикл событий подписчиков одним call_soon_threadsafe на цикл,
+    а не на подписчика.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = defaultdict(set)
+
+    def subscribe(self, channel, maxsize=None):
+        """Вызывается из цикла событий, в котором будет читаться очередь."""
+        subscription = Subscription(
+            asyncio.get_running_loop(), maxsize or settings.SSE_CLIENT_BUFFER
+        )
+        with self._lock:
+            self._channels[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, channel, subscription):
+        with self._lock:
+            subscribers = self._channels.get(channel)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[channel]
+
+    def has_subscribers(self, channel):
+        return channel in self._channels
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        by_loop = defaultdict(list)
+        for subscription in subscribers:
+            by_loop[subscription.loop].append(subscription)
+        for loop, group in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver, group, message)
+            except RuntimeError:
+                for subscription in group:
+                    self.unsubscribe(channel, subscription)
+
+
+def _deliver(subscriptions, message):
+    for subscription in subscriptions:
+        subscription.put(message)
+
+
+broker = Broker()
+
+
+def _post_is_visible(post_id):
+    close_old_connections()
+    try:
+        return Post.objects.published().filter(pk=post_id).exists()
+    finally:
+        close_old_connections()
+
+
+async def _wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def stream_post_events(scope, receive, send, post_id):
+    """
+    Поток text/event-stream с событиями комментариев поста.
+    Ожидающее соединение не занимает поток: к базе обращается только
+    проверка видимости поста при подключении.
+    """
+    if scope['method'] != 'GET':
+        await _send_empty(send, 405)
+        return
+    if not await sync_to_async(_post_is_visible)(post_id):
+        await _send_empty(send, 404)
+        return
+    channel = post_channel(post_id)
+    subscription = broker.subscribe(channel)
+    disconnected = asyncio.ensure_future(_wait_disconnect(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': f'retry: {settings.SSE_RETRY_MS}\n\n'.encode(),
+            'more_body': True,
+        })
+        while True:
+            message = asyncio.ensure_future(subscription.queue.get())
+            done, _ = await asyncio.wait(
+                {message, disconnected},
+                timeout=settings.SSE_KEEPALIVE,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected in done:
+                message.cancel()
+                return
+            if message not in done:
+                message.cancel()
+                body = b': keepalive\n\n'
+            elif message.result() is CLOSE:
+                break
+            else:
+                body = message.result()
+            await send({
+                'type': 'http.response.body', 'body': body, 'more_body': True
+            })
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        disconnected.cancel()
+        broker.unsubscribe(channel, subscription)
+
+
+async def _send_empty(send, status):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+class EventStreamRouter:
+    """
+    ASGI-приложение поверх Django: запросы к blog:post_events
+    обслуживает stream_post_events, остальные передаются дальше.
+    Под WSGI тот же адрес отвечает 204, и браузер не переподключается.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            try:
+                match = resolve(scope['path'])
+            except Resolver404:
+                match = None
+            if match and match.view_name == 'blog:post_events':
+                await stream_post_events(
+                    scope, receive, send, match.kwargs['post_id']
+                )
+                return
+        await self.application(scope, receive, send)
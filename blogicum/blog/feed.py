@@ -0,0 +1,75 @@
+"""
+Поддержка таблицы FeedEntry.
+Строка ленты существует, пока пост и его категория опубликованы;
+её поля повторяют поля карточки поста.
+"""
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import FeedEntry, Post
+
+BATCH_SIZE = 500
+
+
+def is_listed(post):
+    return bool(
+        post.is_published
+        and post.category_id
+        and post.category.is_published
+    )
+
+
+def entry_for(post):
+    """Строка ленты для поста с загруженными автором, категорией и локацией."""
+    location = post.location
+    return FeedEntry(
+        post_id=post.pk,
+        pub_date=post.pub_date,
+        title=post.title,
+        excerpt=post.excerpt,
+        image=post.image.name or '',
+        image_variants=post.image_variants,
+        image_width=post.image_width,
+        image_height=post.image_height,
+        comment_count=post.comment_count,
+        author_id=post.author_id,
+        author_username=post.author.username,
+        category_id=post.category_id,
+        category_title=post.category.title,
+        category_slug=post.category.slug,
+        location_name=(
+            location.name if location and location.is_published else ''
+        ),
+    )
+
+
+def refresh_posts(posts):
+    """
+    Перестраивает строки ленты для постов из QuerySet posts пачками:
+    старые строки удаляются, для видимых постов вставляются новые.
+    """
+    posts = posts.with_related().order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+        with transaction.atomic():
+            FeedEntry.objects.filter(
+                post_id__in=[post.pk for post in batch]
+            ).delete()
+            FeedEntry.objects.bulk_create(
+                entry_for(post) for post in batch if is_listed(post)
+            )
+
+
+def sync_columns(*fields):
+    """Копирует поля из Post во все строки ленты одним запросом."""
+    FeedEntry.objects.update(updated_at=timezone.now(), **{
+        field: Subquery(
+            Post.objects.filter(pk=OuterRef('post_id')).values(field)[:1]
+        )
+        for field in fields
+    })
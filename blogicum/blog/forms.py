@@ -1,6 +1,40 @@
 from django import forms
+from django.conf import settings
+from PIL import Image
 
+from .images import IMAGE_ERRORS
 from .models import Comment, Post, User
+from .uploads import (
+    RejectedUpload, image_limit_error, pixels_limit_error, read_header,
+    size_limit_error
+)
+
+
+class LimitedImageField(forms.ImageField):
+    """
+    Поле изображения с лимитами POST_IMAGE_*.
+    Размер файла, формат и размеры проверяются по заголовку до того,
+    как ImageField проверит изображение целиком.
+    """
+
+    def to_python(self, data):
+        if isinstance(data, RejectedUpload):
+            raise forms.ValidationError(data.error, code='image_limit')
+        if data is None:
+            return super().to_python(data)
+        if data.size > settings.POST_IMAGE_MAX_BYTES:
+            raise forms.ValidationError(size_limit_error(), code='image_limit')
+        try:
+            error = image_limit_error(*read_header(data))
+        except Image.DecompressionBombError:
+            error = pixels_limit_error()
+        except IMAGE_ERRORS + (SyntaxError,):
+            error = None
+        finally:
+            data.seek(0)
+        if error:
+            raise forms.ValidationError(error, code='image_limit')
+        return super().to_python(data)
 
 
 class PostForm(forms.ModelForm):
@@ -9,6 +43,9 @@ class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         exclude = ('author',)
+        field_classes = {
+            'image': LimitedImageField,
+        }
         widgets = {
             'pub_date': forms.DateTimeInput(
                 format='%Y-%m-%d %H:%M',
@@ -0,0 +1,208 @@
+import logging
+import os
+import re
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 85, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 80, 'method': 4},
+}
+EXTENSIONS = {'JPEG': '.jpg', 'PNG': '.png', 'WEBP': '.webp'}
+VARIANT_RE = re.compile(r'^(?P<root>.+)_\d+w\.(?:jpg|png|webp)$')
+IMAGE_ERRORS = (OSError, UnidentifiedImageError, Image.DecompressionBombError)
+
+# Pillow называет многокадровые JPEG камер (MPO) отдельным форматом,
+# хотя первый кадр — обычный JPEG, который показывают браузеры.
+FORMAT_ALIASES = {'MPO': 'JPEG'}
+
+EXIF_ORIENTATION = 0x0112
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def normalize_format(image_format):
+    return FORMAT_ALIASES.get(image_format, image_format)
+
+
+def read_metadata(file):
+    """
+    Возвращает ширину и высоту изображения с учётом EXIF-ориентации,
+    его формат и размер файла в байтах. Читается только заголовок.
+    """
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = image.size
+        image_format = normalize_format(image.format or '')
+        if image.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+    file.seek(0)
+    return {
+        'image_width': width,
+        'image_height': height,
+        'image_size': file.size,
+        'image_format': image_format,
+    }
+
+
+def variant_name(name, width, image_format):
+    """Имя файла уменьшенной копии рядом с оригиналом."""
+    root, _ = os.path.splitext(name)
+    return f'{root}_{width}w{EXTENSIONS[image_format]}'
+
+
+def _output_format(source_format):
+    """
+    Копии в формате оригинала для браузеров без WebP: JPEG остаётся JPEG,
+    всё остальное сохраняется в PNG.
+    """
+    return 'JPEG' if source_format == 'JPEG' else 'PNG'
+
+
+def _encode(image, image_format):
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    elif image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        image = image.convert('RGBA')
+    buffer = BytesIO()
+    image.save(buffer, image_format, **SAVE_OPTIONS.get(image_format, {}))
+    return ContentFile(buffer.getvalue())
+
+
+def _build_variant(storage, name, image, width, image_format):
+    saved_name = variant_name(name, width, image_format)
+    if not storage.exists(saved_name):
+        if width != image.width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+        saved_name = storage.save(saved_name, _encode(image, image_format))
+    return {'name': saved_name, 'width': width, 'format': image_format}
+
+
+def build_variants(name, storage=default_storage):
+    """
+    Создаёт копии изображения шириной POST_IMAGE_VARIANT_WIDTHS в формате
+    оригинала и в WebP, а также WebP-копию в полную ширину.
+    Возвращает список описаний {'name', 'width', 'format'}, включая
+    оригинал. Копии шире оригинала не создаются, уже существующие копии
+    используются повторно: оригинал с тем же именем не меняется.
+    """
+    with storage.open(name) as file, Image.open(file) as source:
+        source_format = normalize_format(source.format)
+        image = ImageOps.exif_transpose(source)
+        image.load()
+    variants = [{'name': name, 'width': image.width, 'format': source_format}]
+    widths = [
+        width for width in settings.POST_IMAGE_VARIANT_WIDTHS
+        if width < image.width
+    ]
+    image_format = _output_format(source_format)
+    for width in widths:
+        variants.append(
+            _build_variant(storage, name, image, width, image_format)
+        )
+    if source_format != 'WEBP':
+        widths.append(image.width)
+    for width in widths:
+        variants.append(_build_variant(storage, name, image, width, 'WEBP'))
+    return sorted(variants, key=lambda variant: variant['width'])
+
+
+def process_post_image(post_id):
+    """
+    Строит копии изображения поста и сохраняет их описание вместе
+    с размерами и форматом оригинала.
+    """
+    from .models import Post
+
+    name = Post.objects.filter(pk=post_id).values_list(
+        'image', flat=True
+    ).first()
+    variants = []
+    metadata = {}
+    if name:
+        try:
+            with default_storage.open(name) as file:
+                metadata = read_metadata(file)
+            variants = build_variants(name)
+        except IMAGE_ERRORS:
+            logger.warning('Не удалось обработать изображение %s', name,
+                           exc_info=True)
+    Post.objects.filter(pk=post_id, image=name or '').update(
+        image_variants=variants, **metadata
+    )
+    return variants
+
+
+def release_time(name):
+    """
+    Время, раньше которого файл изображения нельзя удалять, или None.
+    Файл, записанный или загруженный повторно меньше
+    POST_IMAGE_RELEASE_DELAY секунд назад, может принадлежать посту,
+    который ещё не сохранён в базе.
+    """
+    from .models import Post
+
+    storage = Post._meta.get_field('image').storage
+    try:
+        modified = storage.get_modified_time(name)
+    except OSError:
+        return None
+    reused = storage.get_reused_time(name)
+    if reused is not None:
+        modified = max(modified, reused)
+    release_at = modified + timedelta(
+        seconds=settings.POST_IMAGE_RELEASE_DELAY
+    )
+    return release_at if release_at > timezone.now() else None
+
+
+def release_image(name, variant_names=()):
+    """
+    Удаляет файл изображения и его копии, если на него больше
+    не ссылается ни один пост. Возвращает True, если файлы удалены.
+    """
+    from .models import Post
+
+    if not name or Post.objects.filter(image=name).exists():
+        return False
+    storage = Post._meta.get_field('image').storage
+    for file_name in {name, *variant_names}:
+        storage.delete(file_name)
+    return True
+
+
+def referenced_files(names):
+    """
+    Возвращает имена из names, которые используются постами: изображения
+    постов и их копии. Копия определяется по имени вида <оригинал>_<w>w.
+    """
+    from .models import Post
+
+    names = set(names)
+    roots = {}
+    for name in names:
+        match = VARIANT_RE.match(name)
+        if match:
+            roots.setdefault(match['root'], []).append(name)
+    referenced = set(
+        Post.objects.filter(image__in=names).values_list('image', flat=True)
+    )
+    if roots:
+        query = Q()
+        for root in roots:
+            query |= Q(image__startswith=f'{root}.')
+        for image in Post.objects.filter(query).values_list(
+            'image', flat=True
+        ):
+            referenced.update(roots.get(os.path.splitext(image)[0], ()))
+    return referenced & names
@@ -0,0 +1,122 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import Category, Location, Post, User
+from blog.serializers import PostCardSerializer, image_url
+
+
+def serialize_instance(post):
+    """Та же карточка, собранная из объектов моделей для сравнения."""
+    location = post.location
+    return {
+        'id': post.pk,
+        'title': post.title,
+        'excerpt': post.excerpt,
+        'pub_date': post.pub_date,
+        'is_published': post.is_published,
+        'comment_count': post.comment_count,
+        'image': image_url(post.image.name),
+        'image_width': post.image_width,
+        'image_height': post.image_height,
+        'author': {
+            'id': post.author.pk,
+            'username': post.author.username,
+            'first_name': post.author.first_name,
+            'last_name': post.author.last_name,
+        },
+        'category': {
+            'id': post.category.pk,
+            'title': post.category.title,
+            'slug': post.category.slug,
+            'description': post.category.description,
+        },
+        'location': {
+            'id': location.pk, 'name': location.name
+        } if location and location.is_published else None,
+    }
+
+
+class Command(BaseCommand):
+    """
+    Замеряет выборку и сериализацию в JSON 1000 карточек постов:
+    через строки values() и PostCardSerializer и через объекты моделей
+    с select_related. Тестовые данные создаются в транзакции,
+    которая откатывается после замера.
+    """
+
+    help = 'Сравнивает сериализацию постов API через values() и объекты.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.create_posts(options['posts'])
+            serializer = PostCardSerializer()
+            posts = Post.objects.published().order_by('-pub_date')
+            results = {
+                'values()': self.measure(
+                    lambda: serializer.serialize(
+                        posts.values(*serializer.lookups())
+                    ),
+                    options['iterations']
+                ),
+                'объекты моделей': self.measure(
+                    lambda: [
+                        serialize_instance(post)
+                        for post in posts.with_related()
+                    ],
+                    options['iterations']
+                ),
+            }
+            transaction.set_rollback(True)
+        for title, timings in results.items():
+            self.report(title, timings, options['posts'])
+        speedup = (
+            statistics.median(results['объекты моделей'])
+            / statistics.median(results['values()'])
+        )
+        self.stdout.write(f'Ускорение: {speedup:.1f}x')
+
+    def create_posts(self, count):
+        author = User.objects.create(username='bench-api-author')
+        category = Category.objects.create(
+            title='Бенчмарк', description='Бенчмарк', slug='bench-api'
+        )
+        location = Location.objects.create(name='Бенчмарк')
+        pub_date = timezone.now() - timedelta(days=1)
+        Post.objects.bulk_create(
+            Post(
+                title=f'Публикация {number}',
+                text='Текст публикации для замера.',
+                excerpt='Текст публикации для замера.',
+                pub_date=pub_date - timedelta(seconds=number),
+                author=author,
+                category=category,
+                location=location,
+            )
+            for number in range(count)
+        )
+
+    def measure(self, serialize, iterations):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            json.dumps(serialize(), cls=DjangoJSONEncoder)
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def report(self, title, timings, count):
+        median = statistics.median(timings)
+        self.stdout.write(
+            f'{title}: медиана {median * 1000 / count:.2f} мс на 1000 постов,'
+            f' {count / median * 1000:.0f} постов/с'
+        )
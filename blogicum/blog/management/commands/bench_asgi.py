@@ -0,0 +1,203 @@
+import asyncio
+import importlib
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+
+from django.core.asgi import get_asgi_application
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+from django.urls import clear_url_caches, reverse
+from django.utils import timezone
+
+from blog.feed import refresh_posts
+from blog.models import Category, Location, Post, User
+
+BENCH_SLUG = 'bench-asgi'
+
+
+@contextmanager
+def url_views(async_views):
+    """Перестраивает маршруты blog с синхронными или асинхронными видами."""
+    import blog.urls
+    try:
+        with override_settings(ASYNC_VIEWS=async_views):
+            importlib.reload(blog.urls)
+            clear_url_caches()
+            yield
+    finally:
+        importlib.reload(blog.urls)
+        clear_url_caches()
+
+
+def wsgi_environ(path):
+    return {
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'wsgi.input': BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.url_scheme': 'http',
+    }
+
+
+def asgi_scope(path):
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+
+
+class Command(BaseCommand):
+    """
+    Сравнивает число запросов в секунду и 99-й перцентиль задержки
+    страниц чтения под WSGI (синхронные представления, пул потоков)
+    и под ASGI (асинхронные представления, один цикл событий).
+    Обработчики вызываются в процессе, без сетевого сервера, поэтому
+    замер показывает накладные расходы Django, а не HTTP-сервера.
+    Тестовые данные записываются в базу, чтобы их видели потоки
+    обработчиков, и удаляются после замера.
+    """
+
+    help = 'Сравнивает страницы чтения под ASGI и WSGI.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--posts', type=int, default=50)
+        parser.add_argument(
+            '--no-page-cache',
+            action='store_true',
+            help='Отключить кэш страниц для анонимных пользователей.'
+        )
+
+    def handle(self, *args, **options):
+        overrides = {'DEBUG': False}
+        if options['no_page_cache']:
+            overrides['PAGE_CACHE_TIMEOUT'] = 0
+        author, category = self.create_data(options['posts'])
+        try:
+            with override_settings(**overrides):
+                self.benchmark(self.get_paths(author, category), options)
+        finally:
+            self.delete_data(author, category)
+
+    def get_paths(self, author, category):
+        post = Post.objects.filter(author=author).first()
+        return {
+            'index': reverse('blog:index'),
+            'category': reverse('blog:category_posts', args=[category.slug]),
+            'profile': reverse('blog:profile', args=[author.username]),
+            'post_detail': reverse('blog:post_detail', args=[post.pk]),
+        }
+
+    def benchmark(self, paths, options):
+        count, concurrency = options['requests'], options['concurrency']
+        wsgi = get_wsgi_application()
+        for title, path in paths.items():
+            cache.clear()
+            self.report(
+                f'{title} WSGI', self.run_wsgi(wsgi, path, count, concurrency)
+            )
+            with url_views(async_views=True):
+                asgi = get_asgi_application()
+                cache.clear()
+                self.report(f'{title} ASGI', asyncio.run(
+                    self.run_asgi(asgi, path, count, concurrency)
+                ))
+
+    def run_wsgi(self, application, path, count, concurrency):
+        def request(_):
+            start = time.perf_counter()
+            result = application(wsgi_environ(path), lambda *args: None)
+            try:
+                b''.join(result)
+            finally:
+                result.close()
+            return time.perf_counter() - start
+
+        request(None)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            timings = list(executor.map(request, range(count)))
+        return timings, time.perf_counter() - start
+
+    async def run_asgi(self, application, path, count, concurrency):
+        limit = asyncio.Semaphore(concurrency)
+        disconnect = asyncio.Event()
+
+        async def request():
+            messages = [{'type': 'http.request', 'body': b''}]
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await disconnect.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                pass
+
+            async with limit:
+                start = time.perf_counter()
+                await application(asgi_scope(path), receive, send)
+                return time.perf_counter() - start
+
+        await request()
+        start = time.perf_counter()
+        timings = await asyncio.gather(*(request() for _ in range(count)))
+        elapsed = time.perf_counter() - start
+        disconnect.set()
+        return timings, elapsed
+
+    def create_data(self, count):
+        author = User.objects.create(username=BENCH_SLUG)
+        category = Category.objects.create(
+            title='Бенчмарк', description='Бенчмарк', slug=BENCH_SLUG
+        )
+        location = Location.objects.create(name='Бенчмарк')
+        Post.objects.bulk_create(
+            Post(
+                title=f'Публикация {number}',
+                text='Текст публикации для замера. ' * 50,
+                pub_date=timezone.now(),
+                author=author,
+                category=category,
+                location=location,
+            )
+            for number in range(count)
+        )
+        refresh_posts(Post.objects.filter(author=author))
+        return author, category
+
+    def delete_data(self, author, category):
+        Location.objects.filter(posts__author=author).delete()
+        author.delete()
+        category.delete()
+        cache.clear()
+
+    def report(self, title, result):
+        timings, elapsed = result
+        p99 = statistics.quantiles(timings, n=100)[98] * 1000
+        self.stdout.write(
+            f'{title}: {len(timings) / elapsed:.0f} запросов/с, '
+            f'p99 {p99:.2f} мс'
+        )
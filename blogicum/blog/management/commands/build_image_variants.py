@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from blog.models import Post
+from blog.tasks import process_post_image
+
+
+class Command(BaseCommand):
+    """
+    Строит копии изображений для уже загруженных публикаций
+    и заполняет сведения о размерах и формате оригинала.
+    """
+
+    help = 'Создаёт уменьшенные копии Post.image для srcset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Перестроить копии и у постов, где они уже есть.'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='')
+        if not options['force']:
+            posts = posts.filter(
+                Q(image_variants=[]) | Q(image_width__isnull=True)
+            )
+        total = 0
+        for post_id in posts.values_list('pk', flat=True).iterator():
+            process_post_image(post_id)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f'Обработано постов: {total}.'))
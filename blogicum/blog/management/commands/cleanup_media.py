@@ -0,0 +1,71 @@
+import os
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.images import referenced_files
+from blog.models import Post
+
+
+def scan_files(root, base):
+    """Обходит каталог root и возвращает пути файлов относительно base."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan_files(entry.path, base)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry, Path(entry.path).relative_to(base).as_posix()
+
+
+class Command(BaseCommand):
+    """
+    Удаляет из каталога загрузок Post.image файлы, на которые не ссылается
+    ни один пост. Файлы проверяются пачками, по одному-двум запросам
+    на пачку. Недавно записанные файлы пропускаются: пост, которому
+    принадлежит файл, может быть ещё не сохранён.
+    """
+
+    help = 'Удаляет осиротевшие изображения публикаций из MEDIA_ROOT.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=60 * 60,
+            help='Не трогать файлы моложе указанного числа секунд.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, сколько файлов будет удалено.'
+        )
+
+    def handle(self, *args, **options):
+        field = Post._meta.get_field('image')
+        root = Path(settings.MEDIA_ROOT) / field.upload_to
+        if not root.is_dir():
+            self.stdout.write('Каталог загрузок не найден.')
+            return
+        cutoff = time.time() - options['min_age']
+        files = (
+            name for entry, name in scan_files(root, settings.MEDIA_ROOT)
+            if entry.stat().st_mtime < cutoff
+        )
+        removed = reclaimed = 0
+        while True:
+            batch = list(islice(files, options['batch_size']))
+            if not batch:
+                break
+            for name in set(batch) - referenced_files(batch):
+                reclaimed += field.storage.size(name)
+                removed += 1
+                if not options['dry_run']:
+                    field.storage.delete(name)
+        action = 'Будет удалено' if options['dry_run'] else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} файлов: {removed}, освобождено байт: {reclaimed}.'
+        ))
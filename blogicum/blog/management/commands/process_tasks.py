@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+
+from blog.tasks import claim_tasks, execute, finish
+from blog.worker import init_process, run_task
+
+
+class Command(BaseCommand):
+    """
+    Выполняет фоновые задачи из таблицы blog.Task в пуле процессов.
+    Родительский процесс забирает задачи из очереди и записывает
+    результат, дочерние процессы выполняют саму обработку.
+    """
+
+    help = 'Запускает воркер фоновых задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Размер пула процессов; 0 — выполнять задачи в этом процессе.'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Пауза между опросами пустой очереди, в секундах.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] <= 0:
+            self.run_inline(options)
+        else:
+            self.run_pool(options)
+
+    def run_inline(self, options):
+        while True:
+            claimed = claim_tasks(limit=1)
+            for task_id in claimed:
+                try:
+                    execute(task_id)
+                except Exception as error:
+                    finish(task_id, error)
+                else:
+                    finish(task_id)
+            if not claimed:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+
+    def create_executor(self, workers):
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_process,
+            initargs=(os.environ['DJANGO_SETTINGS_MODULE'],)
+        )
+
+    def restart_executor(self, executor, running, workers):
+        """
+        Заменяет пул, в котором погиб дочерний процесс (например,
+        из-за нехватки памяти). Его задачи завершаются с ошибкой
+        BrokenProcessPool и отмечаются неудачной попыткой.
+        """
+        for future in wait(running).done:
+            finish(running.pop(future), future.exception())
+        executor.shutdown(wait=False)
+        return self.create_executor(workers)
+
+    def run_pool(self, options):
+        workers = options['workers']
+        executor = self.create_executor(workers)
+        running = {}
+        try:
+            while True:
+                for task_id in claim_tasks(limit=workers - len(running)):
+                    try:
+                        future = executor.submit(run_task, task_id)
+                    except BrokenProcessPool:
+                        executor = self.restart_executor(
+                            executor, running, workers
+                        )
+                        future = executor.submit(run_task, task_id)
+                    running[future] = task_id
+                if not running:
+                    if options['once']:
+                        return
+                    time.sleep(options['poll_interval'])
+                    continue
+                done, _ = wait(
+                    running,
+                    timeout=options['poll_interval'],
+                    return_when=FIRST_COMPLETED
+                )
+                broken = False
+                for future in done:
+                    error = future.exception()
+                    broken |= isinstance(error, BrokenProcessPool)
+                    finish(running.pop(future), error)
+                if broken:
+                    executor = self.restart_executor(
+                        executor, running, workers
+                    )
+        finally:
+            executor.shutdown()
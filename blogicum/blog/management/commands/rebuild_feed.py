@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.feed import refresh_posts
+from blog.models import FeedEntry, Post
+
+
+class Command(BaseCommand):
+    """Перестраивает таблицу ленты FeedEntry по всем постам."""
+
+    help = 'Заполняет таблицу FeedEntry заново.'
+
+    def handle(self, *args, **options):
+        refresh_posts(Post.objects.all())
+        total = FeedEntry.objects.count()
+        self.stdout.write(self.style.SUCCESS(f'Строк в ленте: {total}.'))
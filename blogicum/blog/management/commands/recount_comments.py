@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.feed import sync_columns
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    """Пересчитывает счётчик комментариев у всех постов."""
+
+    help = 'Пересчитывает Post.comment_count по таблице комментариев.'
+
+    def handle(self, *args, **options):
+        comments = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        with transaction.atomic():
+            updated = Post.objects.update(
+                comment_count=Coalesce(Subquery(comments), 0)
+            )
+            sync_columns('comment_count')
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано постов: {updated}.')
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.feed import sync_columns
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    """Заполняет анонс и HTML-представление текста у существующих постов."""
+
+    help = 'Пересчитывает Post.excerpt и Post.text_html.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        posts = Post.objects.only('text').order_by('pk')
+        last_pk = 0
+        total = 0
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            for post in batch:
+                post.render_text()
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, ('excerpt', 'text_html'))
+            last_pk = batch[-1].pk
+            total += len(batch)
+        sync_columns('excerpt')
+        self.stdout.write(self.style.SUCCESS(f'Обработано постов: {total}.'))
@@ -0,0 +1,47 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:22
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 10
+
+
+def render_post_text(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.only('text').order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last_pk)[:500])
+        if not batch:
+            break
+        for post in batch:
+            post.excerpt = Truncator(post.text).words(
+                EXCERPT_WORDS, truncate=' …'
+            )
+            post.text_html = linebreaksbr(post.text, autoescape=True)
+        Post.objects.bulk_update(batch, ('excerpt', 'text_html'))
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(default='', editable=False, verbose_name='Анонс'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(default='', editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.RunPython(
+            render_post_text, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_excerpt_text_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(default=list, editable=False, verbose_name='Копии изображения'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:29
+
+import blog.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Загрузите подходящую фотографию - необязательное поле.', storage=blog.storage.ContentHashStorage(), upload_to='posts_images', verbose_name='Фото'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['image'], name='post_image_idx'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_feed(apps, schema_editor):
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.filter(
+        is_published=True, category__is_published=True
+    ).select_related('author', 'category', 'location')
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(
+                post_id=post.pk,
+                pub_date=post.pub_date,
+                title=post.title,
+                excerpt=post.excerpt,
+                image=post.image.name or '',
+                image_variants=post.image_variants,
+                image_width=post.image_width,
+                image_height=post.image_height,
+                comment_count=post.comment_count,
+                author_id=post.author_id,
+                author_username=post.author.username,
+                category_id=post.category_id,
+                category_title=post.category.title,
+                category_slug=post.category.slug,
+                location_name=(
+                    post.location.name
+                    if post.location and post.location.is_published else ''
+                ),
+            )
+            for post in posts.iterator()
+        ),
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0015_post_search_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('excerpt', models.TextField(verbose_name='Анонс')),
+                ('image', models.CharField(blank=True, max_length=100, verbose_name='Фото')),
+                ('image_variants', models.JSONField(default=list, verbose_name='Копии изображения')),
+                ('image_width', models.PositiveIntegerField(blank=True, null=True)),
+                ('image_height', models.PositiveIntegerField(blank=True, null=True)),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('author_username', models.CharField(max_length=150)),
+                ('category_title', models.CharField(max_length=256)),
+                ('category_slug', models.SlugField()),
+                ('location_name', models.CharField(blank=True, help_text='Пусто, если локации нет или она снята с публикации.', max_length=256)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'строка ленты',
+                'verbose_name_plural': 'Лента',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['-pub_date', '-post'], name='feed_entry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['category', '-pub_date', '-post'], name='feed_entry_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['author', '-pub_date', '-post'], name='feed_entry_author_idx'),
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
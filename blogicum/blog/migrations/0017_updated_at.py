@@ -0,0 +1,64 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:49
+
+from django.db import migrations, models
+
+# SQLite пересоздаёт blog_post при добавлении колонки, и триггеры
+# полнотекстового индекса из 0015_post_search_fts удаляются вместе
+# со старой таблицей.
+CREATE_FTS_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS blog_post_fts_insert AFTER INSERT ON blog_post
+BEGIN
+    INSERT INTO blog_post_fts(rowid, title, text)
+    VALUES (new.id, new.title, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS blog_post_fts_delete AFTER DELETE ON blog_post
+BEGIN
+    INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text)
+    VALUES ('delete', old.id, old.title, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS blog_post_fts_update
+AFTER UPDATE OF title, text ON blog_post
+BEGIN
+    INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text)
+    VALUES ('delete', old.id, old.title, old.text);
+    INSERT INTO blog_post_fts(rowid, title, text)
+    VALUES (new.id, new.title, new.text);
+END;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_feed_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='feedentry',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Меняется при любом изменении полей строки; по нему строится версия страниц ленты.', verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.RunSQL(migrations.RunSQL.noop, CREATE_FTS_TRIGGERS),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.RunSQL(CREATE_FTS_TRIGGERS, migrations.RunSQL.noop),
+    ]
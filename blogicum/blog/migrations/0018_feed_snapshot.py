@@ -0,0 +1,27 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(help_text='Область кэша: index, category:<slug> или author:<имя>.', max_length=200, unique=True, verbose_name='Лента')),
+                ('content', models.BinaryField(verbose_name='Документ (gzip)')),
+                ('etag', models.CharField(max_length=64, verbose_name='ETag')),
+                ('generated_at', models.DateTimeField(verbose_name='Изменён')),
+            ],
+            options={
+                'verbose_name': 'RSS-лента',
+                'verbose_name_plural': 'RSS-ленты',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 05:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_feed_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Запущено'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 05:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0019_task_started_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='feedentry',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Меняется при любом изменении полей строки; по нему строится версия страницы поста.', verbose_name='Изменено'),
+        ),
+    ]
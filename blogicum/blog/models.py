@@ -1,12 +1,55 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.db.models.expressions import RawSQL
+from django.db.models.query import ModelIterable
 from django.contrib.auth import get_user_model
+from django.template.defaultfilters import linebreaksbr
+from django.utils import timezone
+from django.utils.text import Truncator
 
 from core.models import PublishedModel
+from . import search
+from .images import IMAGE_ERRORS, read_metadata
+from .storage import ContentHashStorage
 
 
 User = get_user_model()
 
 MAXL_OF_TITLE = 256
+EXCERPT_WORDS = 10
+
+CARD_FIELDS = (
+    'title',
+    'excerpt',
+    'pub_date',
+    'is_published',
+    'image',
+    'image_variants',
+    'image_width',
+    'image_height',
+    'comment_count',
+    'author__username',
+    'category__title',
+    'category__slug',
+    'category__is_published',
+    'location__name',
+    'location__is_published',
+)
+
+
+def publication_cutoff(now=None):
+    """
+    Возвращает момент, до которого посты считаются опубликованными.
+    Время округляется вниз до PUBLICATION_TIME_GRANULARITY секунд, чтобы
+    текст запроса и ключи кэша менялись не чаще одного раза за интервал.
+    """
+    now = now or timezone.now()
+    granularity = settings.PUBLICATION_TIME_GRANULARITY
+    if not granularity:
+        return now
+    return now - timedelta(seconds=now.timestamp() % granularity)
 
 
 class Category(PublishedModel):
@@ -48,6 +91,55 @@ class Location(PublishedModel):
         return self.name
 
 
+class PostQuerySet(models.QuerySet):
+    """QuerySet публикаций."""
+
+    def with_related(self):
+        """Подгружает автора, категорию и локацию одним запросом."""
+        return self.select_related('author', 'category', 'location')
+
+    def for_cards(self):
+        """
+        Загружает только поля, которые выводит includes/post_card.html.
+        Остальные колонки поста, категории, локации и автора не читаются.
+        """
+        return self.only(*CARD_FIELDS)
+
+    def published(self, now=None):
+        """Посты, видимые всем пользователям на момент now."""
+        return self.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=publication_cutoff(now)
+        )
+
+    def search(self, query):
+        """
+        Полнотекстовый поиск по заголовку и тексту через таблицу FTS5
+        blog_post_fts. Добавляет search_rank (bm25, меньше — лучше)
+        и search_snippet с отмеченными совпадениями для search.highlight.
+        """
+        fts_query = search.to_fts_query(query)
+        if not fts_query:
+            return self.none().annotate(
+                search_rank=models.Value(0.0),
+                search_snippet=models.Value('')
+            )
+        return self.extra(
+            tables=[search.FTS_TABLE],
+            where=[
+                f'{search.FTS_TABLE} MATCH %s',
+                f'{search.FTS_TABLE}.rowid = {Post._meta.db_table}.id',
+            ],
+            params=[fts_query]
+        ).annotate(
+            search_rank=RawSQL(search.rank_sql(), ()),
+            search_snippet=RawSQL(
+                search.snippet_sql(), (search.MARK_START, search.MARK_END)
+            )
+        )
+
+
 class Post(PublishedModel):
     """Модель для публкаций."""
 
@@ -89,19 +181,176 @@ class Post(PublishedModel):
     image = models.ImageField(
         'Фото',
         upload_to='posts_images',
+        storage=ContentHashStorage(),
         blank=True,
         help_text='Загрузите подходящую фотографию - необязательное поле.'
     )
+    excerpt = models.TextField(
+        default='',
+        editable=False,
+        verbose_name='Анонс'
+    )
+    text_html = models.TextField(
+        default='',
+        editable=False,
+        verbose_name='Текст в HTML'
+    )
+    image_variants = models.JSONField(
+        default=list,
+        editable=False,
+        verbose_name='Копии изображения'
+    )
+    image_width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Ширина изображения'
+    )
+    image_height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Высота изображения'
+    )
+    image_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Размер изображения, байт'
+    )
+    image_format = models.CharField(
+        max_length=16,
+        blank=True,
+        editable=False,
+        verbose_name='Формат изображения'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+
+    objects = PostQuerySet.as_manager()
+
+    derived_fields = ('comment_count', 'image_variants')
+    image_metadata_fields = (
+        'image_width', 'image_height', 'image_size', 'image_format'
+    )
 
     class Meta:
         default_related_name = 'posts'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_published_feed_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx'
+            ),
+            models.Index(
+                fields=('image',),
+                name='post_image_idx'
+            ),
+        )
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
     def __str__(self):
         return self.title
 
+    def is_visible(self, now=None):
+        """Проверяет на загруженном объекте условия PostQuerySet.published."""
+        return (
+            self.is_published
+            and self.category is not None
+            and self.category.is_published
+            and self.pub_date <= publication_cutoff(now)
+        )
+
+    def render_text(self):
+        """Заполняет анонс и HTML-представление текста."""
+        self.excerpt = Truncator(self.text).words(EXCERPT_WORDS, truncate=' …')
+        self.text_html = linebreaksbr(self.text, autoescape=True)
+
+    def read_image_metadata(self):
+        """
+        Заполняет размеры, формат и объём изображения по загруженному
+        файлу, пока он ещё не сохранён в хранилище.
+        """
+        metadata = dict.fromkeys(self.image_metadata_fields)
+        metadata['image_format'] = ''
+        if self.image:
+            try:
+                metadata.update(read_metadata(self.image.file))
+            except IMAGE_ERRORS:
+                pass
+        for name, value in metadata.items():
+            setattr(self, name, value)
+
+    def _srcset(self, webp):
+        variants = [
+            variant for variant in self.image_variants
+            if (variant['format'] == 'WEBP') is webp
+        ]
+        if len(variants) < 2 and not webp:
+            return ''
+        return ', '.join(
+            f"{self.image.storage.url(variant['name'])} {variant['width']}w"
+            for variant in variants
+        )
+
+    @property
+    def image_srcset(self):
+        """Значение атрибута srcset из копий в формате оригинала."""
+        return self._srcset(webp=False)
+
+    @property
+    def image_webp_srcset(self):
+        """Значение srcset для <source type="image/webp">."""
+        return self._srcset(webp=True)
+
+    def save(self, *args, **kwargs):
+        """
+        Не перезаписывает счётчики и копии изображения при сохранении
+        существующего поста: они изменяются только UPDATE в blog.signals.
+        Анонс и HTML текста пересчитываются, если сохраняется текст,
+        а сведения об изображении — при загрузке нового файла.
+        """
+        update_fields = kwargs.get('update_fields')
+        if ('text' not in self.get_deferred_fields()
+                and (update_fields is None or 'text' in update_fields)):
+            self.render_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'excerpt', 'text_html'
+                }
+        update_fields = kwargs.get('update_fields')
+        if ('image' not in self.get_deferred_fields()
+                and (update_fields is None or 'image' in update_fields)
+                and not (self.image and self.image._committed)):
+            self.read_image_metadata()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, *self.image_metadata_fields
+                }
+        if (not self._state.adding and self.pk is not None
+                and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert')):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.derived_fields
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Модель для комментариев."""
@@ -118,6 +367,10 @@ class Comment(models.Model):
         'Добавлено',
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        auto_now=True,
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -126,3 +379,244 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('created_at',)
+
+
+class PostCardIterable(ModelIterable):
+    """Возвращает вместо строк FeedEntry посты для шаблона карточки."""
+
+    def __iter__(self):
+        for entry in super().__iter__():
+            yield entry.as_post()
+
+
+class FeedEntryQuerySet(models.QuerySet):
+    """QuerySet строк ленты."""
+
+    def visible(self, now=None):
+        """Строки постов, время публикации которых уже наступило."""
+        return self.filter(pub_date__lte=publication_cutoff(now))
+
+    def as_posts(self):
+        """Итерирует объекты Post, собранные из строк ленты."""
+        clone = self._chain()
+        clone._iterable_class = PostCardIterable
+        return clone
+
+
+class FeedEntry(models.Model):
+    """
+    Денормализованная строка ленты: опубликованный пост опубликованной
+    категории вместе с полями его карточки. Строки поддерживаются
+    сигналами из blog.signals (см. blog.feed), поэтому ленты читают
+    одну узкую таблицу без соединений. Отложенные посты хранятся
+    заранее и отсекаются по pub_date при чтении.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Публикация'
+    )
+    pub_date = models.DateTimeField('Дата и время публикации')
+    title = models.CharField('Заголовок', max_length=MAXL_OF_TITLE)
+    excerpt = models.TextField('Анонс')
+    image = models.CharField('Фото', max_length=100, blank=True)
+    image_variants = models.JSONField('Копии изображения', default=list)
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    comment_count = models.PositiveIntegerField(default=0)
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор'
+    )
+    author_username = models.CharField(max_length=150)
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Категория'
+    )
+    category_title = models.CharField(max_length=MAXL_OF_TITLE)
+    category_slug = models.SlugField()
+    location_name = models.CharField(
+        max_length=MAXL_OF_TITLE,
+        blank=True,
+        help_text='Пусто, если локации нет или она снята с публикации.'
+    )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        auto_now=True,
+        help_text=(
+            'Меняется при любом изменении полей строки; '
+            'по нему строится версия страницы поста.'
+        )
+    )
+
+    objects = FeedEntryQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-post'),
+                name='feed_entry_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-post'),
+                name='feed_entry_category_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-post'),
+                name='feed_entry_author_idx'
+            ),
+        )
+        verbose_name = 'строка ленты'
+        verbose_name_plural = 'Лента'
+
+    def as_post(self):
+        """
+        Собирает несохраняемый объект Post с автором, категорией
+        и локацией, достаточный для includes/post_card.html. Поля,
+        которых нет в строке ленты, отложены: обращение к ним — это
+        лишний запрос, а не молча подставленное значение.
+        """
+        db = self._state.db
+        post = _from_db(
+            Post, db,
+            id=self.post_id,
+            is_published=True,
+            title=self.title,
+            pub_date=self.pub_date,
+            author_id=self.author_id,
+            category_id=self.category_id,
+            image=self.image,
+            excerpt=self.excerpt,
+            image_variants=self.image_variants,
+            image_width=self.image_width,
+            image_height=self.image_height,
+            comment_count=self.comment_count,
+        )
+        Post.author.field.set_cached_value(post, _from_db(
+            User, db, id=self.author_id, username=self.author_username
+        ))
+        Post.category.field.set_cached_value(post, _from_db(
+            Category, db,
+            id=self.category_id,
+            is_published=True,
+            title=self.category_title,
+            slug=self.category_slug,
+        ))
+        Post.location.field.set_cached_value(post, _from_db(
+            Location, db, is_published=True, name=self.location_name
+        ) if self.location_name else None)
+        return post
+
+
+def _from_db(model, db, **values):
+    """Объект модели из базы, в котором загружены только поля values."""
+    names = [
+        field.attname for field in model._meta.concrete_fields
+        if field.attname in values
+    ]
+    return model.from_db(db, names, [values[name] for name in names])
+
+
+class TaskQuerySet(models.QuerySet):
+    """QuerySet фоновых задач."""
+
+    @staticmethod
+    def lease_cutoff(now=None):
+        return (now or timezone.now()) - timedelta(
+            seconds=settings.TASK_LEASE_TIMEOUT
+        )
+
+    def stale(self, now=None):
+        """
+        Задачи, которые числятся выполняющимися дольше TASK_LEASE_TIMEOUT:
+        их воркер, скорее всего, погиб, не записав результат.
+        """
+        return self.filter(
+            models.Q(started_at__lt=self.lease_cutoff(now))
+            | models.Q(started_at__isnull=True),
+            status=Task.Status.RUNNING
+        )
+
+    def retryable(self, now=None):
+        """Все задачи, кроме тех, что выполняются сейчас."""
+        return self.exclude(
+            status=Task.Status.RUNNING,
+            started_at__gte=self.lease_cutoff(now)
+        )
+
+
+class Task(models.Model):
+    """Модель для задач фоновой обработки."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Выполнена'
+        FAILED = 'failed', 'Ошибка'
+
+    name = models.CharField('Задача', max_length=64)
+    payload = models.JSONField('Параметры', default=dict, blank=True)
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    run_after = models.DateTimeField(
+        'Запустить после',
+        default=timezone.now
+    )
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    started_at = models.DateTimeField('Запущено', null=True, blank=True)
+    finished_at = models.DateTimeField('Завершено', null=True, blank=True)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('run_after', 'pk')
+        indexes = (
+            models.Index(
+                fields=('run_after',),
+                condition=models.Q(status='pending'),
+                name='task_pending_idx'
+            ),
+        )
+        verbose_name = 'задача'
+        verbose_name_plural = 'Фоновые задачи'
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
+
+
+class FeedSnapshot(models.Model):
+    """
+    Готовый RSS-документ ленты, сжатый gzip. Документы перестраивает
+    фоновая задача regenerate_feed после изменений постов, категорий
+    и комментариев, поэтому запрос ленты только отдаёт байты.
+    """
+
+    scope = models.CharField(
+        'Лента',
+        max_length=200,
+        unique=True,
+        help_text='Область кэша: index, category:<slug> или author:<имя>.'
+    )
+    content = models.BinaryField('Документ (gzip)')
+    etag = models.CharField('ETag', max_length=64)
+    generated_at = models.DateTimeField('Изменён')
+
+    class Meta:
+        verbose_name = 'RSS-лента'
+        verbose_name_plural = 'RSS-ленты'
+
+    def __str__(self):
+        return self.scope
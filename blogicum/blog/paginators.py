@@ -0,0 +1,199 @@
+import base64
+import binascii
+import math
+from datetime import datetime
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+
+
+class InvalidCursor(InvalidPage):
+    """Курсор страницы повреждён или не может быть разобран."""
+
+    pass
+
+
+class CursorPage:
+    """
+    Страница курсорной пагинации.
+    Повторяет интерфейс django.core.paginator.Page, который используют шаблоны.
+    key — ключ курсора, по которому открыта страница: от него строятся
+    ссылки, если страница пуста (например, посты по старой ссылке удалены).
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous,
+                 key=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.key = key
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        """Курсор для перехода к более старым записям."""
+        if not self._has_next:
+            return None
+        if not self.object_list:
+            return self.paginator.encode_key(CursorPaginator.AFTER, *self.key)
+        return self.paginator.encode_cursor(
+            CursorPaginator.AFTER, self.object_list[-1]
+        )
+
+    @property
+    def previous_cursor(self):
+        """Курсор для перехода к более новым записям."""
+        if not self._has_previous:
+            return None
+        if not self.object_list:
+            return self.paginator.encode_key(CursorPaginator.BEFORE, *self.key)
+        return self.paginator.encode_cursor(
+            CursorPaginator.BEFORE, self.object_list[0]
+        )
+
+
+class CursorPaginator:
+    """
+    Курсорная (keyset) пагинация по паре (pub_date, id).
+    Вместо OFFSET в запрос добавляется условие на ключ последней записи
+    предыдущей страницы, поэтому стоимость любой страницы одинакова.
+    """
+
+    AFTER = 'a'
+    BEFORE = 'b'
+
+    # Границы id в курсоре: больше не помещается в целое SQLite.
+    MIN_PK = -2 ** 63
+    MAX_PK = 2 ** 63 - 1
+
+    # Первая страница начинается с наибольшего значения поля.
+    descending = True
+
+    def __init__(self, queryset, per_page, date_field='pub_date'):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.date_field = date_field
+
+    def get_key(self, obj):
+        return getattr(obj, self.date_field), obj.pk
+
+    def encode_value(self, value):
+        return value.isoformat()
+
+    def decode_value(self, raw):
+        return datetime.fromisoformat(raw)
+
+    def encode_key(self, direction, value, pk):
+        raw = f'{direction}|{self.encode_value(value)}|{pk}'.encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def encode_cursor(self, direction, obj):
+        return self.encode_key(direction, *self.get_key(obj))
+
+    def decode_cursor(self, cursor):
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(cursor + padding).decode()
+            direction, value, pk = raw.split('|')
+            pk = int(pk)
+            if direction not in (self.AFTER, self.BEFORE):
+                raise ValueError
+            if not self.MIN_PK <= pk <= self.MAX_PK:
+                raise ValueError
+            return direction, self.decode_value(value), pk
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise InvalidCursor('Некорректный курсор страницы.')
+
+    def _ordered(self, queryset, forward):
+        field = self.date_field
+        if forward == self.descending:
+            return queryset.order_by(f'-{field}', '-pk')
+        return queryset.order_by(field, 'pk')
+
+    def _seek(self, queryset, forward, value, pk):
+        lookup = 'lt' if forward == self.descending else 'gt'
+        field = self.date_field
+        return queryset.filter(
+            Q(**{f'{field}__{lookup}': value})
+            | Q(**{field: value, f'pk__{lookup}': pk})
+        )
+
+    def page(self, cursor=None):
+        queryset = self.queryset
+        key = None
+        if not cursor:
+            direction = self.AFTER
+            queryset = self._ordered(queryset, forward=True)
+        else:
+            direction, value, pk = self.decode_cursor(cursor)
+            key = value, pk
+            forward = direction == self.AFTER
+            queryset = self._ordered(
+                self._seek(queryset, forward, value, pk), forward
+            )
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if direction == self.AFTER:
+            return CursorPage(object_list, self, has_more, bool(cursor), key)
+        object_list.reverse()
+        return CursorPage(object_list, self, True, has_more, key)
+
+
+class RankCursorPaginator(CursorPaginator):
+    """
+    Курсорная пагинация результатов поиска по паре (search_rank, id):
+    сначала самые релевантные посты, то есть с наименьшим bm25.
+    """
+
+    descending = False
+
+    def __init__(self, queryset, per_page, date_field='search_rank'):
+        super().__init__(queryset, per_page, date_field)
+
+    def encode_value(self, value):
+        return repr(value)
+
+    def decode_value(self, raw):
+        value = float(raw)
+        if not math.isfinite(value):
+            raise ValueError
+        return value
+
+
+class ValuesCursorPaginator(CursorPaginator):
+    """
+    Курсорная пагинация строк queryset.values(). В строках должны быть
+    поле курсора и id.
+    """
+
+    def __init__(self, queryset, per_page, date_field='pub_date',
+                 descending=True):
+        super().__init__(queryset, per_page, date_field)
+        self.descending = descending
+
+    def get_key(self, row):
+        return row[self.date_field], row['id']
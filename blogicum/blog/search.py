@@ -0,0 +1,44 @@
+import re
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+FTS_TABLE = 'blog_post_fts'
+
+# Вес совпадений в заголовке и в тексте для функции bm25.
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+MARK_START = '\x02'
+MARK_END = '\x03'
+SNIPPET_TOKENS = 24
+
+WORD_RE = re.compile(r'\w+')
+
+
+def to_fts_query(query):
+    """
+    Превращает пользовательский запрос в запрос FTS5: каждое слово
+    ищется по префиксу, все слова должны встретиться в посте.
+    Операторы и кавычки FTS5 из ввода не используются.
+    """
+    return ' '.join(f'"{word}"*' for word in WORD_RE.findall(query))
+
+
+def rank_sql():
+    return f'bm25({FTS_TABLE}, {TITLE_WEIGHT}, {TEXT_WEIGHT})'
+
+
+def snippet_sql():
+    return (
+        f"snippet({FTS_TABLE}, 1, %s, %s, '…', {SNIPPET_TOKENS})"
+    )
+
+
+def highlight(snippet):
+    """Экранирует фрагмент текста и выделяет совпадения тегом <mark>."""
+    return mark_safe(
+        escape(snippet)
+        .replace(MARK_START, '<mark>')
+        .replace(MARK_END, '</mark>')
+    )
@@ -0,0 +1,168 @@
+from .models import Post
+
+
+class InvalidFields(ValueError):
+    """Запрошены поля, которых нет у ресурса."""
+
+    pass
+
+
+def image_url(name):
+    return Post.image.field.storage.url(name) if name else None
+
+
+class ValuesSerializer:
+    """
+    Сериализует строки queryset.values() в словари для JSON.
+    Объекты моделей не создаются: serializer сообщает, какие колонки
+    выбрать (lookups()), и переименовывает их в поля ресурса.
+    Вложенные ресурсы читаются из тех же строк через префикс
+    связи, например author__username.
+
+    fields — имя поля ресурса и путь к колонке, converters — функции
+    преобразования значений, embedded — вложенные ресурсы и их классы.
+    """
+
+    fields = {}
+    default_fields = None
+    converters = {}
+    embedded = {}
+
+    def __init__(self, fields=None, embedded_fields=None, prefix=''):
+        embedded_fields = embedded_fields or {}
+        names = fields or self.default_fields or (
+            *self.fields, *self.embedded
+        )
+        unknown = set(names) - set(self.fields) - set(self.embedded)
+        unknown |= set(embedded_fields) - set(self.embedded)
+        if unknown:
+            raise InvalidFields(
+                f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+            )
+        self.prefix = prefix
+        self.columns = [
+            (name, prefix + self.fields[name], self.converters.get(name))
+            for name in names if name in self.fields
+        ]
+        self.children = [
+            (name, self.embedded[name](
+                embedded_fields.get(name), prefix=f'{prefix}{name}__'
+            ))
+            for name in names if name in self.embedded
+        ]
+
+    def lookups(self):
+        """Колонки, которые нужно передать в values()."""
+        lookups = {self.prefix + 'id'}
+        lookups.update(lookup for _, lookup, _ in self.columns)
+        for _, child in self.children:
+            lookups.update(child.lookups())
+        return sorted(lookups)
+
+    def is_empty(self, row):
+        """Вложенный ресурс отсутствует, например пустой внешний ключ."""
+        return row[self.prefix + 'id'] is None
+
+    def to_dict(self, row):
+        data = {
+            name: convert(row[lookup]) if convert else row[lookup]
+            for name, lookup, convert in self.columns
+        }
+        for name, child in self.children:
+            data[name] = None if child.is_empty(row) else child.to_dict(row)
+        return data
+
+    def serialize(self, rows):
+        to_dict = self.to_dict
+        return [to_dict(row) for row in rows]
+
+
+class AuthorSerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'username': 'username',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+    }
+
+
+class ProfileSerializer(AuthorSerializer):
+    """Пользователь с полями страницы профиля."""
+
+    fields = {
+        **AuthorSerializer.fields,
+        'date_joined': 'date_joined',
+        'is_staff': 'is_staff',
+    }
+
+
+class CategorySerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'title': 'title',
+        'slug': 'slug',
+        'description': 'description',
+    }
+
+
+class LocationSerializer(ValuesSerializer):
+    """Неопубликованная локация не показывается, как и в шаблонах."""
+
+    fields = {
+        'id': 'id',
+        'name': 'name',
+    }
+
+    def lookups(self):
+        return sorted({*super().lookups(), self.prefix + 'is_published'})
+
+    def is_empty(self, row):
+        return (super().is_empty(row)
+                or not row[self.prefix + 'is_published'])
+
+
+class PostSerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'title': 'title',
+        'text': 'text',
+        'excerpt': 'excerpt',
+        'pub_date': 'pub_date',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+        'is_published': 'is_published',
+        'comment_count': 'comment_count',
+        'image': 'image',
+        'image_width': 'image_width',
+        'image_height': 'image_height',
+    }
+    converters = {
+        'image': image_url,
+    }
+    embedded = {
+        'author': AuthorSerializer,
+        'category': CategorySerializer,
+        'location': LocationSerializer,
+    }
+
+
+class PostCardSerializer(PostSerializer):
+    """Поля карточки поста в списках: без полного текста."""
+
+    default_fields = (
+        'id', 'title', 'excerpt', 'pub_date', 'is_published',
+        'comment_count', 'image', 'image_width', 'image_height',
+        'author', 'category', 'location',
+    )
+
+
+class CommentSerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'text': 'text',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+    embedded = {
+        'author': AuthorSerializer,
+    }
@@ -0,0 +1,348 @@
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .cache import (
+    INDEX_SCOPE, author_scope, bump_scopes, category_scope, post_scopes
+)
+from .events import broker, format_event, post_channel
+from .feed import refresh_posts
+from .models import Category, Comment, FeedEntry, Location, Post, User
+from .tasks import enqueue, enqueue_once
+
+# Удаляемый пользователь и его посты. Каскад удаляет их вместе
+# с комментариями по одному объекту; обработчики ниже пропускают
+# такие объекты, а pre_delete пользователя обновляет счётчики
+# и сбрасывает страницы сразу для всех.
+_author_deletion = ContextVar('author_deletion', default=(None, frozenset()))
+
+
+def _is_login_update(update_fields):
+    return bool(update_fields) and set(update_fields) <= {'last_login'}
+
+
+def _is_deleted_with_author(author_id=None, post_id=None):
+    deleted_author, deleted_posts = _author_deletion.get()
+    return (
+        author_id is not None and author_id == deleted_author
+        or post_id in deleted_posts
+    )
+
+
+def _posts_scopes(posts):
+    """Области кэша, затронутые изменением набора постов."""
+    scopes = {INDEX_SCOPE}
+    rows = posts.order_by().values_list(
+        'category__slug', 'author__username'
+    ).distinct()
+    for category_slug, username in rows:
+        scopes |= post_scopes(category_slug, username)
+    return scopes
+
+
+def _invalidate_scopes(scopes):
+    """Сбрасывает кэш страниц областей и ставит в очередь сборку их лент."""
+    bump_scopes(scopes)
+    enqueue_once('regenerate_feeds', scopes=sorted(scopes))
+
+
+def _enqueue_release(name, variants):
+    """
+    Задача создаётся в той же транзакции, что и изменение поста:
+    воркер увидит её только после коммита, а при откате её не будет.
+    """
+    enqueue(
+        'release_image',
+        image_name=name,
+        variant_names=[variant['name'] for variant in variants]
+    )
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, **kwargs):
+    """Увеличивает счётчик комментариев поста при создании комментария."""
+    if created and instance.post_id:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+        FeedEntry.objects.filter(post_id=instance.post_id).update(
+            comment_count=F('comment_count') + 1,
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, **kwargs):
+    """Уменьшает счётчик комментариев поста при удалении комментария."""
+    if instance.post_id and not _is_deleted_with_author(
+        instance.author_id, instance.post_id
+    ):
+        Post.objects.filter(
+            pk=instance.post_id,
+            comment_count__gt=0
+        ).update(comment_count=F('comment_count') - 1)
+        FeedEntry.objects.filter(
+            post_id=instance.post_id,
+            comment_count__gt=0
+        ).update(
+            comment_count=F('comment_count') - 1,
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, created=True, **kwargs):
+    """Сбрасывает кэш страниц и RSS-лент с числом комментариев поста."""
+    if _is_deleted_with_author(instance.author_id, instance.post_id):
+        return
+    if created and instance.post_id:
+        _invalidate_scopes(
+            _posts_scopes(Post.objects.filter(pk=instance.post_id))
+        )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def publish_comment_event(sender, instance, created=False, **kwargs):
+    """
+    Отправляет подписчикам потока событий поста фрагмент комментария.
+    Фрагмент рендерится один раз для всех подписчиков и без кнопок
+    автора; событие уходит после коммита транзакции.
+    """
+    channel = post_channel(instance.post_id)
+    if not instance.post_id or not broker.has_subscribers(channel):
+        return
+    if kwargs['signal'] is post_delete:
+        message = format_event('deleted', instance.pk, instance.pk)
+    else:
+        message = format_event(
+            'created' if created else 'updated',
+            render_to_string('includes/comment.html', {'comment': instance}),
+            instance.pk
+        )
+    transaction.on_commit(lambda: broker.publish(channel, message))
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=User)
+def remember_cache_scopes(sender, instance, update_fields=None, **kwargs):
+    """
+    Запоминает области кэша объекта до изменения slug или автора
+    и прежнюю видимость категории.
+    """
+    instance._old_cache_scopes = set()
+    instance._was_published = False
+    if instance.pk is None or _is_login_update(update_fields):
+        return
+    if sender is Category:
+        old_slug, instance._was_published = Category.objects.filter(
+            pk=instance.pk
+        ).values_list('slug', 'is_published').first() or (None, False)
+        instance._old_cache_scopes = {category_scope(old_slug)}
+    else:
+        old_username = User.objects.filter(
+            pk=instance.pk
+        ).values_list('username', flat=True).first()
+        instance._old_cache_scopes = {author_scope(old_username)}
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_state(sender, instance, **kwargs):
+    """Запоминает изображение и области кэша поста до изменения."""
+    instance._old_cache_scopes = set()
+    instance._old_image = ''
+    instance._old_image_variants = []
+    if instance.pk is None:
+        return
+    old = Post.objects.filter(pk=instance.pk).values(
+        'image', 'image_variants', 'category__slug', 'author__username'
+    ).first()
+    if old:
+        instance._old_image = old['image']
+        instance._old_image_variants = old['image_variants']
+        instance._old_cache_scopes = post_scopes(
+            old['category__slug'], old['author__username']
+        )
+
+
+@receiver(post_save, sender=Post)
+def schedule_image_processing(sender, instance, **kwargs):
+    """
+    Ставит в очередь построение копий изображения, если оно изменилось.
+    До готовности копий пост показывает оригинал. Прежний файл удаляет
+    фоновая задача, если на него не ссылаются другие посты.
+    """
+    old_image = getattr(instance, '_old_image', '')
+    if instance.image.name == old_image:
+        return
+    if old_image:
+        _enqueue_release(old_image, instance._old_image_variants)
+    instance.image_variants = []
+    Post.objects.filter(pk=instance.pk).update(image_variants=[])
+    if instance.image:
+        enqueue('process_post_image', post_id=instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    """
+    Ставит в очередь удаление изображения удалённого поста.
+    Срабатывает и при каскадном удалении.
+    """
+    deferred = instance.get_deferred_fields()
+    if 'image' in deferred or not instance.image:
+        return
+    variants = [] if 'image_variants' in deferred else instance.image_variants
+    _enqueue_release(instance.image.name, variants)
+
+
+@receiver(post_save, sender=Post)
+def update_post_feed_entry(sender, instance, **kwargs):
+    """
+    Перестраивает строку ленты поста. Подключён после
+    schedule_image_processing, чтобы увидеть сброшенные копии.
+    """
+    refresh_posts(Post.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Category)
+def update_category_feed_entries(sender, instance, **kwargs):
+    """
+    Снятие категории с публикации удаляет её строки ленты одним
+    запросом, публикация пачками добавляет строки её постов.
+    """
+    entries = FeedEntry.objects.filter(category=instance)
+    if not instance.is_published:
+        entries.delete()
+    elif not getattr(instance, '_was_published', False):
+        refresh_posts(instance.posts.all())
+    else:
+        entries.update(
+            category_title=instance.title,
+            category_slug=instance.slug,
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def update_location_feed_entries(sender, instance, **kwargs):
+    """Обновляет название локации в строках ленты её постов."""
+    name = instance.name
+    if kwargs['signal'] is pre_delete or not instance.is_published:
+        name = ''
+    FeedEntry.objects.filter(post__location=instance).update(
+        location_name=name,
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=User)
+def update_author_feed_entries(
+        sender, instance, created, update_fields=None, **kwargs
+):
+    """
+    Обновляет имя автора в строках ленты его постов. updated_at
+    меняется при любом сохранении: страница профиля показывает
+    и другие поля пользователя. Версия страниц постов, где он
+    оставил комментарии, тоже меняется.
+    """
+    if created or _is_login_update(update_fields):
+        return
+    now = timezone.now()
+    FeedEntry.objects.filter(author=instance).update(
+        author_username=instance.username,
+        updated_at=now
+    )
+    FeedEntry.objects.filter(post__comments__author=instance).update(
+        updated_at=now
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш и RSS-ленты главной, категории и автора поста."""
+    if _is_deleted_with_author(post_id=instance.pk):
+        return
+    category_slug = instance.category.slug if instance.category_id else None
+    _invalidate_scopes(
+        post_scopes(category_slug, instance.author.username)
+        | getattr(instance, '_old_cache_scopes', set())
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def invalidate_category_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш и RSS-ленты категории и авторов её постов."""
+    _invalidate_scopes(
+        {category_scope(instance.slug)}
+        | getattr(instance, '_old_cache_scopes', set())
+        | _posts_scopes(instance.posts.all())
+    )
+
+
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def invalidate_location_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш страниц с постами, привязанными к локации."""
+    bump_scopes(_posts_scopes(instance.posts.all()))
+
+
+@receiver(pre_delete, sender=User)
+def start_author_deletion(sender, instance, **kwargs):
+    """
+    Отмечает посты удаляемого пользователя и уменьшает счётчики
+    комментариев чужих постов одним обновлением на пост.
+    """
+    _author_deletion.set((
+        instance.pk,
+        frozenset(instance.posts.values_list('pk', flat=True))
+    ))
+    counts = Comment.objects.filter(author=instance).exclude(
+        Q(post=None) | Q(post__author=instance)
+    ).order_by().values('post_id').annotate(count=Count('pk'))
+    for row in counts:
+        comment_count = Greatest(F('comment_count') - row['count'], 0)
+        Post.objects.filter(pk=row['post_id']).update(
+            comment_count=comment_count
+        )
+        FeedEntry.objects.filter(post_id=row['post_id']).update(
+            comment_count=comment_count,
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_delete, sender=User)
+def finish_author_deletion(sender, instance, **kwargs):
+    _author_deletion.set((None, frozenset()))
+
+
+@receiver(post_save, sender=User)
+@receiver(pre_delete, sender=User)
+def invalidate_author_pages(sender, instance, update_fields=None, **kwargs):
+    """
+    Сбрасывает кэш страницы пользователя и карточек его постов;
+    имя автора есть и в RSS-лентах. При удалении сбрасываются
+    и страницы постов с его комментариями.
+    """
+    if _is_login_update(update_fields):
+        return
+    posts = Q(author=instance)
+    if kwargs['signal'] is pre_delete:
+        posts |= Q(comments__author=instance)
+    _invalidate_scopes(
+        {author_scope(instance.username)}
+        | getattr(instance, '_old_cache_scopes', set())
+        | _posts_scopes(Post.objects.filter(posts))
+    )
@@ -0,0 +1,58 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+REUSED_KEY = 'blog:blob-reused:{}'
+
+
+@deconstructible
+class ContentHashStorage(FileSystemStorage):
+    """
+    Файловое хранилище, которое называет файлы по SHA-256 содержимого.
+    Одинаковые файлы хранятся один раз, и содержимое файла с данным
+    именем никогда не меняется. Удалять файл можно только после того,
+    как на него не осталось ссылок (см. задачу blog.tasks.release_image).
+    """
+
+    def hashed_name(self, name, content):
+        """Имя вида <каталог>/ab/abcdef….<расширение>."""
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        digest = sha256.hexdigest()
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        return os.path.join(directory, digest[:2], digest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            self.mark_reused(name)
+            return name
+        return super().save(name, content, max_length=max_length)
+
+    def mark_reused(self, name):
+        """
+        Запоминает повторную загрузку существующего файла: задача
+        удаления, запущенная до коммита нового поста, его не тронет
+        (см. blog.images.release_time). Время хранится в кэше, а не
+        в mtime файла: по mtime строятся валидаторы при раздаче.
+        """
+        cache.set(
+            REUSED_KEY.format(name), timezone.now(),
+            settings.POST_IMAGE_RELEASE_DELAY
+        )
+
+    def get_reused_time(self, name):
+        """Время последней повторной загрузки файла или None."""
+        return cache.get(REUSED_KEY.format(name))
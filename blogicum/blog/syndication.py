@@ -0,0 +1,178 @@
+"""
+RSS-ленты публикаций: общая, категории и автора.
+Документы строятся заранее (regenerate) и хранятся в FeedSnapshot
+сжатыми; FeedView отдаёт их с поддержкой условных запросов.
+"""
+import gzip
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Min
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.feedgenerator import Rss201rev2Feed
+from django.utils.http import http_date
+from django.views.generic import View
+
+from . import tasks
+from .cache import INDEX_SCOPE, author_scope, category_scope
+from .models import Category, FeedSnapshot, User, publication_cutoff
+from .views import PostQuerySetMixin
+
+CONTENT_TYPE = 'application/rss+xml; charset=utf-8'
+
+
+class BlogFeed(Rss201rev2Feed):
+    """RSS 2.0 с числом комментариев поста в элементе slash:comments."""
+
+    def rss_attributes(self):
+        attrs = super().rss_attributes()
+        attrs['xmlns:slash'] = 'http://purl.org/rss/1.0/modules/slash/'
+        return attrs
+
+    def add_item_elements(self, handler, item):
+        super().add_item_elements(handler, item)
+        handler.addQuickElement('slash:comments', str(item['comment_count']))
+
+
+def absolute_url(path):
+    return settings.SITE_URL.rstrip('/') + path
+
+
+def feed_source(scope):
+    """
+    Заголовок, адрес страницы и фильтр постов ленты scope
+    или None, если категория снята с публикации или автора нет.
+    """
+    kind, _, value = scope.partition(':')
+    if scope == INDEX_SCOPE:
+        return 'Блогикум', reverse('blog:index'), {}
+    if kind == 'category':
+        category = Category.objects.filter(
+            slug=value, is_published=True
+        ).first()
+        if category is None:
+            return None
+        return (
+            f'Блогикум: {category.title}',
+            reverse('blog:category_posts', args=[value]),
+            {'category': category}
+        )
+    if kind == 'author':
+        author = User.objects.filter(username=value).first()
+        if author is None:
+            return None
+        return (
+            f'Блогикум: @{value}',
+            reverse('blog:profile', args=[value]),
+            {'author': author}
+        )
+    return None
+
+
+def render_feed(title, link, posts):
+    feed = BlogFeed(
+        title=title,
+        link=absolute_url(link),
+        description=title,
+        language=settings.LANGUAGE_CODE
+    )
+    for post in posts:
+        url = absolute_url(reverse('blog:post_detail', args=[post.pk]))
+        feed.add_item(
+            title=post.title,
+            link=url,
+            unique_id=url,
+            description=post.text_html,
+            pubdate=post.pub_date,
+            updateddate=post.updated_at,
+            author_name=post.author.username,
+            categories=[post.category.title],
+            comment_count=post.comment_count
+        )
+    return feed.writeString('utf-8').encode()
+
+
+def regenerate(scope):
+    """
+    Перестраивает документ ленты scope. Если содержимое не изменилось,
+    снимок, его ETag и дата не трогаются. Возвращает время, когда
+    появится ближайший отложенный пост ленты, или None.
+    """
+    source = feed_source(scope)
+    if source is None:
+        FeedSnapshot.objects.filter(scope=scope).delete()
+        return None
+    title, link, filters = source
+    post_querysets = PostQuerySetMixin()
+    posts = post_querysets.get_pub_queryset().filter(**filters)
+    content = render_feed(title, link, posts[:settings.FEED_ITEMS])
+    # Слабый ETag: сжатое и несжатое представления равнозначны.
+    etag = f'W/"{hashlib.md5(content).hexdigest()}"'
+    if not FeedSnapshot.objects.filter(scope=scope, etag=etag).exists():
+        FeedSnapshot.objects.update_or_create(scope=scope, defaults={
+            'content': gzip.compress(content, mtime=0),
+            'etag': etag,
+            'generated_at': timezone.now(),
+        })
+    next_pub_date = post_querysets.get_base_queryset().filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__gt=publication_cutoff(),
+        **filters
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    if next_pub_date is None:
+        return None
+    return next_pub_date + timedelta(
+        seconds=settings.PUBLICATION_TIME_GRANULARITY
+    )
+
+
+class FeedView(View):
+    """
+    Отдаёт готовый документ ленты. Сжатые байты передаются как есть
+    клиентам с Accept-Encoding: gzip, остальным распаковываются.
+    Снимок строится здесь, только если его ещё нет.
+    """
+
+    http_method_names = ['get', 'head']
+
+    def get_scope(self):
+        if 'category_slug' in self.kwargs:
+            return category_scope(self.kwargs['category_slug'])
+        if 'username' in self.kwargs:
+            return author_scope(self.kwargs['username'])
+        return INDEX_SCOPE
+
+    def get_snapshot(self):
+        scope = self.get_scope()
+        snapshot = FeedSnapshot.objects.filter(scope=scope).first()
+        if snapshot is None:
+            tasks.regenerate_feed(scope)
+            snapshot = FeedSnapshot.objects.filter(scope=scope).first()
+        if snapshot is None:
+            raise Http404('Лента не найдена.')
+        return snapshot
+
+    def get(self, request, *args, **kwargs):
+        snapshot = self.get_snapshot()
+        last_modified = int(snapshot.generated_at.timestamp())
+        response = get_conditional_response(
+            request, etag=snapshot.etag, last_modified=last_modified
+        )
+        if response is None:
+            content = bytes(snapshot.content)
+            if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+                response = HttpResponse(content, content_type=CONTENT_TYPE)
+                response['Content-Encoding'] = 'gzip'
+            else:
+                response = HttpResponse(
+                    gzip.decompress(content), content_type=CONTENT_TYPE
+                )
+        response['ETag'] = snapshot.etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
@@ -0,0 +1,177 @@
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from . import images, syndication
+from .cache import bump_scopes, post_scopes
+from .feed import refresh_posts
+from .models import Post, Task
+
+TASKS = {}
+
+
+def task(func):
+    """Регистрирует функцию как фоновую задачу под её именем."""
+    TASKS[func.__name__] = func
+    return func
+
+
+def enqueue(name, run_after=None, **payload):
+    """
+    Ставит задачу в очередь; выполнит её команда process_tasks
+    не раньше run_after.
+    """
+    if name not in TASKS:
+        raise ValueError(f'Неизвестная задача: {name}.')
+    return Task.objects.create(
+        name=name, payload=payload, run_after=run_after or timezone.now()
+    )
+
+
+def enqueue_once(name, run_after=None, **payload):
+    """
+    Как enqueue, но не создаёт задачу, если такая же задача уже ждёт
+    в очереди и запустится не позже run_after. Выполняющаяся задача
+    не считается: она могла прочитать данные до изменения.
+    """
+    run_after = run_after or timezone.now()
+    pending = Task.objects.filter(
+        name=name,
+        payload=payload,
+        status=Task.Status.PENDING,
+        run_after__lte=run_after
+    )
+    if pending.exists():
+        return None
+    return enqueue(name, run_after=run_after, **payload)
+
+
+def reclaim_stale_tasks():
+    """
+    Возвращает в очередь задачи, воркер которых пропал, не записав
+    результат. Такой запуск считается неудачной попыткой: задача,
+    исчерпавшая попытки, помечается ошибкой.
+    """
+    now = timezone.now()
+    stale = Task.objects.stale(now)
+    error = 'Воркер не завершил задачу за отведённое время.'
+    stale.filter(attempts__gte=settings.TASK_MAX_ATTEMPTS).update(
+        status=Task.Status.FAILED, last_error=error, finished_at=now
+    )
+    stale.update(status=Task.Status.PENDING, last_error=error, run_after=now)
+
+
+def claim_tasks(limit):
+    """Забирает из очереди до limit готовых к запуску задач."""
+    reclaim_stale_tasks()
+    claimed = []
+    ready = Task.objects.filter(
+        status=Task.Status.PENDING,
+        run_after__lte=timezone.now()
+    ).values_list('pk', flat=True)[:limit]
+    for task_id in ready:
+        updated = Task.objects.filter(
+            pk=task_id, status=Task.Status.PENDING
+        ).update(
+            status=Task.Status.RUNNING,
+            attempts=F('attempts') + 1,
+            started_at=timezone.now()
+        )
+        if updated:
+            claimed.append(task_id)
+    return claimed
+
+
+def execute(task_id):
+    """Выполняет задачу; вызывается в процессе из пула воркера."""
+    task_object = Task.objects.get(pk=task_id)
+    TASKS[task_object.name](**task_object.payload)
+
+
+def finish(task_id, error=None):
+    """Отмечает результат задачи и планирует повтор после ошибки."""
+    if error is None:
+        Task.objects.filter(pk=task_id).update(
+            status=Task.Status.DONE,
+            last_error='',
+            finished_at=timezone.now()
+        )
+        return
+    task_object = Task.objects.get(pk=task_id)
+    task_object.last_error = ''.join(
+        traceback.format_exception(type(error), error, error.__traceback__)
+    )
+    if task_object.attempts < settings.TASK_MAX_ATTEMPTS:
+        task_object.status = Task.Status.PENDING
+        task_object.run_after = timezone.now() + timedelta(
+            seconds=settings.TASK_RETRY_DELAY * task_object.attempts
+        )
+    else:
+        task_object.status = Task.Status.FAILED
+        task_object.finished_at = timezone.now()
+    task_object.save(
+        update_fields=('last_error', 'status', 'run_after', 'finished_at')
+    )
+
+
+@task
+def process_post_image(post_id):
+    """
+    Строит копии изображения, обновляет строку ленты поста
+    и сбрасывает кэш страниц с ним.
+    """
+    images.process_post_image(post_id)
+    refresh_posts(Post.objects.filter(pk=post_id))
+    post = Post.objects.filter(pk=post_id).values(
+        'category__slug', 'author__username'
+    ).first()
+    if post:
+        bump_scopes(
+            post_scopes(post['category__slug'], post['author__username'])
+        )
+
+
+@task
+def release_image(image_name, variant_names=()):
+    """
+    Удаляет файлы изображения, на которое не осталось ссылок.
+    Недавно записанный файл откладывается до истечения
+    POST_IMAGE_RELEASE_DELAY.
+    """
+    release_at = images.release_time(image_name) if image_name else None
+    if release_at is not None:
+        enqueue(
+            'release_image',
+            run_after=release_at,
+            image_name=image_name,
+            variant_names=list(variant_names)
+        )
+        return
+    images.release_image(image_name, variant_names)
+
+
+@task
+def regenerate_feed(scope, scheduled=False):
+    """
+    Перестраивает RSS-документ ленты. Если в ленте есть отложенные
+    посты, следующая сборка планируется на время первого из них.
+    Плановая сборка публикует отложенный пост и поэтому сбрасывает
+    и версию области, по которой строятся кэш и ETag страниц.
+    """
+    if scheduled:
+        bump_scopes({scope})
+    next_run = syndication.regenerate(scope)
+    if next_run is not None:
+        enqueue_once(
+            'regenerate_feed', run_after=next_run, scope=scope, scheduled=True
+        )
+
+
+@task
+def regenerate_feeds(scopes):
+    """Перестраивает RSS-документы нескольких лент одной задачей."""
+    for scope in scopes:
+        regenerate_feed(scope)
@@ -0,0 +1,128 @@
+import warnings
+from io import SEEK_END, BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
+
+from .images import IMAGE_ERRORS, normalize_format
+
+# Сколько первых байт файла хранится для разбора заголовка изображения.
+HEADER_SNIFF_BYTES = 256 * 1024
+
+
+def image_limit_error(image_format, width, height):
+    """
+    Проверяет формат и размеры изображения по его заголовку.
+    Возвращает текст ошибки или None, если изображение допустимо.
+    """
+    if image_format not in settings.POST_IMAGE_FORMATS:
+        return (
+            'Поддерживаются изображения в форматах '
+            f'{", ".join(settings.POST_IMAGE_FORMATS)}.'
+        )
+    max_side = settings.POST_IMAGE_MAX_SIDE
+    if width > max_side or height > max_side:
+        return f'Ширина и высота изображения не должны превышать {max_side}.'
+    if width * height > settings.POST_IMAGE_MAX_PIXELS:
+        return pixels_limit_error()
+    return None
+
+
+def pixels_limit_error():
+    return (
+        'Изображение не должно содержать больше '
+        f'{settings.POST_IMAGE_MAX_PIXELS // 10 ** 6} мегапикселей.'
+    )
+
+
+def size_limit_error():
+    return (
+        'Размер файла не должен превышать '
+        f'{filesizeformat(settings.POST_IMAGE_MAX_BYTES)}.'
+    )
+
+
+def read_header(file):
+    """
+    Открывает изображение без декодирования пикселей и возвращает
+    (формат, ширина, высота). Предупреждения Pillow о числе пикселей
+    не нужны: лимиты проверяет image_limit_error.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+        with Image.open(file) as image:
+            return (normalize_format(image.format), *image.size)
+
+
+class RejectedUpload(UploadedFile):
+    """
+    Файл, отклонённый обработчиком загрузки. Данные не сохраняются,
+    причину показывает форма.
+    """
+
+    def __init__(self, name, content_type, error):
+        super().__init__(BytesIO(), name, content_type, 0)
+        self.error = error
+
+
+class ImageLimitUploadHandler(FileUploadHandler):
+    """
+    Добавляется первым в request.upload_handlers представлениями поста
+    (ImageUploadLimitMixin), остальные загрузки сайта не ограничивает.
+    Считает байты загружаемого файла и разбирает заголовок изображения
+    по первым фрагментам. Если файл превышает POST_IMAGE_MAX_BYTES или
+    заголовок не проходит image_limit_error, остаток файла пропускается
+    без записи, а вместо файла возвращается RejectedUpload. Иначе данные
+    передаются следующим обработчикам без изменений.
+    """
+
+    request_too_large = False
+
+    def handle_raw_input(
+            self, input_data, META, content_length, boundary, encoding=None
+    ):
+        self.request_too_large = (
+            content_length is not None
+            and content_length > settings.POST_IMAGE_MAX_BYTES
+            + (settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0)
+        )
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.header = BytesIO()
+        self.error = size_limit_error() if self.request_too_large else None
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.error:
+            return None
+        self.received += len(raw_data)
+        if self.received > settings.POST_IMAGE_MAX_BYTES:
+            self.error = size_limit_error()
+            return None
+        if self.header is not None:
+            self.check_header(raw_data)
+        return None if self.error else raw_data
+
+    def check_header(self, raw_data):
+        self.header.seek(0, SEEK_END)
+        self.header.write(raw_data)
+        self.header.seek(0)
+        try:
+            self.error = image_limit_error(*read_header(self.header))
+        except Image.DecompressionBombError:
+            self.error = pixels_limit_error()
+        except IMAGE_ERRORS + (SyntaxError,):
+            if self.received < HEADER_SNIFF_BYTES:
+                return
+        self.header = None
+
+    def file_complete(self, file_size):
+        if self.error:
+            return RejectedUpload(
+                self.file_name, self.content_type, self.error
+            )
+        return None
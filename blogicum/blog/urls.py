@@ -1,16 +1,28 @@
+from django.conf import settings
 from django.urls import path, include
 
-from . import views
+from . import syndication, views
 
 app_name = 'blog'
 
+
+def read_view(view_class):
+    """Страницы чтения под ASGI обслуживают асинхронные представления."""
+    if settings.ASYNC_VIEWS:
+        return view_class.as_async_view()
+    return view_class.as_view()
+
+
 post_urls = [
     path('create/',
          views.PostCreateView.as_view(),
          name='create_post'),
     path('<int:post_id>/',
-         views.PostDetailView.as_view(),
+         read_view(views.PostDetailView),
          name='post_detail'),
+    path('<int:post_id>/events/',
+         views.PostEventsView.as_view(),
+         name='post_events'),
     path('<int:post_id>/edit/',
          views.PostUpdateView.as_view(),
          name='edit_post'),
@@ -29,14 +41,22 @@ post_urls = [
 ]
 
 urlpatterns = [
-    path('', views.IndexListView.as_view(), name='index'),
+    path('', read_view(views.IndexListView), name='index'),
+    path('feed/', syndication.FeedView.as_view(), name='feed'),
     path('posts/', include(post_urls)),
+    path('search/', views.SearchListView.as_view(), name='search'),
     path('category/<slug:category_slug>/',
-         views.CategoryListView.as_view(),
+         read_view(views.CategoryListView),
          name='category_posts'),
+    path('category/<slug:category_slug>/feed/',
+         syndication.FeedView.as_view(),
+         name='category_feed'),
     path('profile/<str:username>/',
-         views.ProfileListView.as_view(),
+         read_view(views.ProfileListView),
          name='profile'),
+    path('profile/<str:username>/feed/',
+         syndication.FeedView.as_view(),
+         name='profile_feed'),
     path('edit_profile/',
          views.ProfileUpdateView.as_view(),
          name='edit_profile'),
@@ -1,117 +1,428 @@
+import hashlib
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Count, F, Max, Prefetch
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.views.generic import (
-    CreateView, DeleteView, DetailView, ListView, UpdateView
+    CreateView, DeleteView, DetailView, ListView, UpdateView, View
 )
-from django.utils import timezone
 from django.urls import reverse
-
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, parse_http_date_safe, urlencode
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from .cache import (
+    INDEX_SCOPE, author_scope, category_scope, get_scope_versions,
+    has_session_cookie, is_page_cacheable, page_cache_key
+)
 from .forms import CommentForm, MyUserForm, PostForm
-from .models import Category, Comment, Post, User
+from .models import Category, Comment, FeedEntry, Post, User
+from .paginators import CursorPaginator, InvalidCursor, RankCursorPaginator
+from .search import highlight
+from .uploads import ImageLimitUploadHandler
+
+
+class AuthorObjectMixin:
+    """
+    Загружает изменяемый объект один раз и проверяет авторство.
+    Объект кэшируется на представлении: get_object(), проверка прав
+    и шаблоны используют одну и ту же загруженную запись.
+    """
 
+    related_fields = ()
 
-class CommentChangeMixin:
+    def get_queryset(self):
+        return super().get_queryset().select_related(*self.related_fields)
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_fetched_object'):
+            self._fetched_object = super().get_object(queryset)
+        return self._fetched_object
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.get_object().author_id != request.user.id:
+            return redirect('blog:post_detail', kwargs['post_id'])
+        return super().dispatch(request, *args, **kwargs)
+
+
+class CommentChangeMixin(AuthorObjectMixin):
     """Отображает данные для изменения комментария, соответствующего поста."""
 
     model = Comment
     pk_url_kwarg = 'comment_id'
     template_name = 'blog/comment.html'
 
-    def dispatch(self, request, *args, **kwargs):
-        comment_object = get_object_or_404(
-            Comment,
-            pk=kwargs['comment_id']
-        )
-        if comment_object.author != request.user:
-            return redirect('blog:post_detail', kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
+    def get_queryset(self):
+        return super().get_queryset().filter(post_id=self.kwargs['post_id'])
 
     def get_success_url(self):
         return reverse('blog:post_detail',
                        kwargs={'post_id': self.kwargs['post_id']})
 
 
-class PostChangeMixin:
+class PostChangeMixin(AuthorObjectMixin):
     """Отображает данные для изменения поста."""
 
     model = Post
     pk_url_kwarg = 'post_id'
     template_name = 'blog/create.html'
+    related_fields = ('category', 'location')
+
+
+class ImageUploadLimitMixin:
+    """
+    Проверяет загружаемое изображение поста при чтении тела запроса
+    обработчиком ImageLimitUploadHandler.
+    Обработчик нужно добавить до того, как request.POST прочитает
+    CsrfViewMiddleware, поэтому проверка CSRF выполняется здесь же.
+    """
 
+    @method_decorator(csrf_exempt)
     def dispatch(self, request, *args, **kwargs):
-        post_object = get_object_or_404(Post, pk=kwargs['post_id'])
-        if post_object.author != request.user:
-            return redirect('blog:post_detail', kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
+        request.upload_handlers.insert(0, ImageLimitUploadHandler(request))
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
+
+class CursorPaginationMixin:
+    """
+    Заменяет постраничную пагинацию на курсорную по (pub_date, id),
+    если в настройках задан PAGINATION_MODE = 'cursor'.
+    """
+
+    cursor_kwarg = 'cursor'
+    cursor_paginator_class = CursorPaginator
+
+    def paginate_queryset(self, queryset, page_size):
+        if settings.PAGINATION_MODE != 'cursor':
+            return super().paginate_queryset(queryset, page_size)
+        paginator = self.cursor_paginator_class(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+def cached_page_response(request, response):
+    """
+    Закэшированная страница или 304, если у клиента та же версия:
+    ETag и Last-Modified сохранены в кэше вместе с ответом.
+    """
+    etag = response.get('ETag')
+    if etag is None:
+        return response
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=parse_http_date_safe(response['Last-Modified']),
+        response=response
+    ) or response
+
+
+class AsyncViewMixin:
+    """
+    as_async_view() возвращает асинхронную версию представления для ASGI.
+    ORM и кэш Django 3.2 синхронные, поэтому на промахе представление
+    выполняется целиком за один переход sync_to_async, а не за переход
+    на каждый запрос к базе. Ответ, для которого база не нужна,
+    get_async_response() возвращает прямо в цикле событий, а если
+    для него нужен блокирующий ввод-вывод (response_blocks_loop()),
+    то за отдельный переход sync_to_async.
+    """
+
+    @classmethod
+    def as_async_view(cls, **initkwargs):
+        sync_view = sync_to_async(cls.as_view(**initkwargs))
+
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            if self.response_blocks_loop():
+                response = await sync_to_async(self.get_async_response)()
+            else:
+                response = self.get_async_response()
+            if response is None:
+                response = await sync_view(request, *args, **kwargs)
+            return response
+
+        view.view_class = cls
+        view.view_initkwargs = initkwargs
+        update_wrapper(view, cls, updated=())
+        return view
+
+    def get_async_response(self):
+        return None
+
+    def response_blocks_loop(self):
+        return False
+
+
+class AnonymousPageCacheMixin(AsyncViewMixin):
+    """
+    Кэширует страницу целиком для анонимных пользователей.
+    Кэш сбрасывается сигналами из blog.signals по областям,
+    которые возвращает get_cache_scopes().
+    """
+
+    # Бэкенды кэша в памяти процесса: к ним можно обращаться из цикла
+    # событий, не блокируя другие запросы. Остальные, в том числе
+    # файловый, читаются в потоке.
+    loop_safe_caches = (LocMemCache, DummyCache)
+
+    def get_cache_scopes(self):
+        raise NotImplementedError(
+            'Определите get_cache_scopes() в дочернем классе.'
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request, self.get_cache_scopes())
+        response = cache.get(key)
+        if response is not None:
+            return cached_page_response(request, response)
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: cache.set(
+                    key, rendered, settings.PAGE_CACHE_TIMEOUT
+                )
+            )
+        return response
+
+    def get_async_response(self):
+        """
+        Закэшированная страница для запроса без cookie сессии.
+        Такой запрос анонимный, и request.user не нужно загружать из базы.
+        """
+        request = self.request
+        if (has_session_cookie(request)
+                or not is_page_cacheable(request, anonymous=True)):
+            return None
+        response = cache.get(page_cache_key(request, self.get_cache_scopes()))
+        if response is None:
+            return None
+        return cached_page_response(request, response)
+
+    def response_blocks_loop(self):
+        # cache — прокси, isinstance() нужно проверять у самого бэкенда.
+        return not isinstance(caches['default'], self.loop_safe_caches)
+
+
+class ConditionalPageMixin:
+    """
+    Отвечает 304 на If-None-Match и If-Modified-Since анонимных
+    пользователей до выборки постов и рендеринга страницы.
+
+    По умолчанию версию страницы дают версии областей кэша из
+    get_cache_scopes() без запросов к базе: их сбрасывает любое
+    изменение постов, категорий, локаций, авторов и комментариев,
+    а плановая сборка RSS-ленты — публикация отложенного поста.
+    Запрос без валидаторов версию не проверяет: её заголовки берутся
+    из get_rendered_page_version() после рендеринга.
+    """
+
+    def get_page_version(self):
+        """Возвращает (etag, last_modified) или (None, None)."""
+        versions = get_scope_versions(self.get_cache_scopes())
+        digest = hashlib.md5(
+            '|'.join(map(str, versions)).encode()
+        ).hexdigest()
+        return f'W/"{digest}"', max(versions) // 10 ** 9
+
+    def get_rendered_page_version(self):
+        """Версия уже построенной страницы; может обойтись без запросов."""
+        return self.get_page_version()
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated):
+            return super().dispatch(request, *args, **kwargs)
+        if ('HTTP_IF_NONE_MATCH' in request.META
+                or 'HTTP_IF_MODIFIED_SINCE' in request.META):
+            etag, last_modified = self.get_page_version()
+            if etag is not None:
+                response = get_conditional_response(
+                    request, etag=etag, last_modified=last_modified
+                )
+                if response is not None:
+                    return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            etag, last_modified = self.get_rendered_page_version()
+            if etag is not None:
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+        return response
 
 
 class PostQuerySetMixin:
     """
     1. Создает базовый QuerySet объекта Post со всеми связанными моделями.
     2. Создает публичный QuerySet для отображения всем пользователям.
+    Оба QuerySet строятся на каждый запрос, чтобы отложенные публикации
+    появлялись без перезапуска процесса.
     """
 
     model = Post
-    queryset = Post.objects.annotate(
-        comment_count=Count('comments')
-    ).select_related(
-        'author',
-        'category',
-        'location'
-    ).order_by('-pub_date')
-    pub_queryset = queryset.filter(
-        is_published=True,
-        category__is_published=True,
-        pub_date__lte=timezone.now()
-    )
-
-
-class IndexListView(PostQuerySetMixin, ListView):
+
+    def get_base_queryset(self):
+        return Post.objects.with_related().order_by('-pub_date')
+
+    def get_pub_queryset(self):
+        return self.get_base_queryset().published()
+
+
+class PostListMixin(AnonymousPageCacheMixin, ConditionalPageMixin,
+                    PostQuerySetMixin, CursorPaginationMixin):
+    """Общие настройки страниц со списком карточек постов."""
+
+    paginate_by = settings.PAGE_SIZE
+
+    def get_base_queryset(self):
+        return super().get_base_queryset().for_cards()
+
+    def get_feed_queryset(self):
+        """
+        Опубликованные посты из таблицы FeedEntry в виде объектов Post.
+        Видимость в ней та же, что у get_pub_queryset().
+        """
+        return FeedEntry.objects.visible().order_by(
+            '-pub_date', '-post'
+        ).as_posts()
+
+
+class IndexListView(PostListMixin, ListView):
     """Выводит на главную страницу список постов."""
 
     template_name = 'blog/index.html'
-    paginate_by = settings.PAGE_SIZE
+
+    def get_cache_scopes(self):
+        return {INDEX_SCOPE}
 
     def get_queryset(self):
-        return super().pub_queryset
+        return self.get_feed_queryset()
+
+
+class SearchListView(PostListMixin, ListView):
+    """Выводит опубликованные посты, найденные по запросу q."""
+
+    template_name = 'blog/search.html'
+    cursor_paginator_class = RankCursorPaginator
 
+    def get_cache_scopes(self):
+        return {INDEX_SCOPE}
 
-class PostDetailView(PostQuerySetMixin, DetailView):
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return self.get_pub_queryset().search(self.query).order_by(
+            'search_rank', 'pk'
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        for post in context['page_obj']:
+            post.snippet_html = highlight(post.search_snippet)
+        context['query'] = self.query
+        context['pagination_query'] = urlencode({'q': self.query}) + '&'
+        return context
+
+
+class PostDetailView(AsyncViewMixin, ConditionalPageMixin,
+                     PostQuerySetMixin, DetailView):
     """Отображает полное описание выбранного поста."""
 
     pk_url_kwarg = 'post_id'
     template_name = 'blog/detail.html'
 
-    def get_queryset(self):
-        post_object = get_object_or_404(
-            Post,
-            pk=self.kwargs['post_id']
+    @staticmethod
+    def format_page_version(updated_at, count, comments_updated):
+        if updated_at is None:
+            return None, None
+        parts = (updated_at, count, comments_updated)
+        digest = hashlib.md5('|'.join(map(str, parts)).encode()).hexdigest()
+        last_modified = max(updated_at, comments_updated or updated_at)
+        return f'W/"{digest}"', int(last_modified.timestamp())
+
+    def get_page_version(self):
+        """
+        Версия страницы поста — один запрос к его строке ленты:
+        updated_at строки меняется вместе с постом, категорией,
+        локацией и автором, а число и последнее изменение комментариев
+        учитывают их добавление, удаление и правку. Строки нет у
+        невидимого поста: такую страницу видит только автор.
+        """
+        version = FeedEntry.objects.visible().filter(
+            post_id=self.kwargs[self.pk_url_kwarg]
+        ).values('updated_at').annotate(
+            count=Count('post__comments'),
+            comments_updated=Max('post__comments__updated_at')
+        ).first() or {}
+        return self.format_page_version(
+            version.get('updated_at'), version.get('count'),
+            version.get('comments_updated')
         )
-        if post_object.author != self.request.user:
-            return super().pub_queryset.filter(
-                pk=self.kwargs['post_id'],
+
+    def get_rendered_page_version(self):
+        """Та же версия по загруженному посту и его комментариям."""
+        comments = self.object.comments.all()
+        return self.format_page_version(
+            self.object.feed_updated_at,
+            len(comments),
+            max((comment.updated_at for comment in comments), default=None)
+        )
+
+    def get_queryset(self):
+        return self.get_base_queryset().annotate(
+            feed_updated_at=F('feed_entry__updated_at')
+        ).prefetch_related(
+            Prefetch(
+                'comments',
+                queryset=Comment.objects.select_related('author')
             )
-        return super().queryset.filter(
-            pk=self.kwargs['post_id']
         )
 
+    def get_object(self, queryset=None):
+        post_object = super().get_object(queryset)
+        if (post_object.author_id != self.request.user.id
+                and not post_object.is_visible()):
+            raise Http404('Публикация не найдена.')
+        return post_object
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (
-            self.object.comments.select_related('author')
-        )
+        context['comments'] = self.object.comments.all()
         return context
 
 
-class CategoryListView(PostQuerySetMixin, ListView):
+class PostEventsView(View):
+    """
+    Поток событий комментариев поста обслуживает blog.events под ASGI.
+    Сюда запрос попадает только под WSGI: ответ 204 сообщает
+    EventSource, что переподключаться не нужно.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(status=204)
+
+
+class CategoryListView(PostListMixin, ListView):
     """Отображает все опубликованные посты выбранной категории."""
 
     category_obj = None
     template_name = 'blog/category.html'
-    paginate_by = settings.PAGE_SIZE
+
+    def get_cache_scopes(self):
+        return {category_scope(self.kwargs['category_slug'])}
 
     def get_queryset(self):
         self.category_obj = get_object_or_404(
@@ -119,8 +430,7 @@ class CategoryListView(PostQuerySetMixin, ListView):
             slug=self.kwargs['category_slug'],
             is_published=True
         )
-        return self.pub_queryset.filter(
-            category__slug=self.kwargs['category_slug'])
+        return self.get_feed_queryset().filter(category=self.category_obj)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -128,12 +438,14 @@ class CategoryListView(PostQuerySetMixin, ListView):
         return context
 
 
-class ProfileListView(PostQuerySetMixin, ListView):
+class ProfileListView(PostListMixin, ListView):
     """Отображает страницу пользователя с опубликованными записями."""
 
     user_object = None
     template_name = 'blog/profile.html'
-    paginate_by = settings.PAGE_SIZE
+
+    def get_cache_scopes(self):
+        return {author_scope(self.kwargs['username'])}
 
     def get_queryset(self):
         self.user_object = get_object_or_404(
@@ -141,9 +453,8 @@ class ProfileListView(PostQuerySetMixin, ListView):
             username=self.kwargs['username']
         )
         if self.user_object != self.request.user:
-            return super().pub_queryset.filter(
-                author__username=self.kwargs['username'])
-        return super().queryset.filter(
+            return self.get_feed_queryset().filter(author=self.user_object)
+        return self.get_base_queryset().filter(
             author__username=self.kwargs['username'])
 
     def get_context_data(self, **kwargs):
@@ -201,7 +512,7 @@ class CommentDeleteView(LoginRequiredMixin, CommentChangeMixin, DeleteView):
     pass
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(ImageUploadLimitMixin, LoginRequiredMixin, CreateView):
     """Отображает форму создания поста."""
 
     model = Post
@@ -216,7 +527,9 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return reverse('blog:profile', kwargs={'username': self.request.user})
 
 
-class PostUpdateView(LoginRequiredMixin, PostChangeMixin, UpdateView):
+class PostUpdateView(
+    ImageUploadLimitMixin, LoginRequiredMixin, PostChangeMixin, UpdateView
+):
     """Отображает форму для изменения поста."""
 
     form_class = PostForm
@@ -0,0 +1,19 @@
+"""
+Точки входа для процессов пула команды process_tasks.
+Модуль не импортирует модели, чтобы его можно было загрузить
+в новом процессе до инициализации Django.
+"""
+import os
+
+import django
+
+
+def init_process(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def run_task(task_id):
+    from .tasks import execute
+
+    execute(task_id)
@@ -3,5 +3,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+os.environ.setdefault('BLOGICUM_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
+
+from blog.events import EventStreamRouter  # noqa: E402
+
+application = EventStreamRouter(application)
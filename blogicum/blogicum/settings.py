@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -92,8 +93,83 @@ LOGIN_REDIRECT_URL = 'blog:index'
 
 PAGE_SIZE = 10
 
+API_MAX_PAGE_SIZE = 100
+
+# Адрес сайта для абсолютных ссылок в RSS-лентах, которые строятся
+# фоновой задачей вне запроса.
+SITE_URL = 'http://127.0.0.1:8000'
+
+FEED_ITEMS = 20
+
+PAGINATION_MODE = 'cursor'
+
+PUBLICATION_TIME_GRANULARITY = 60
+
+# Кэш страниц и версии его областей общие для всех процессов сайта
+# и воркера process_tasks: сброс области в одном процессе виден
+# остальным. Файловый кэш работает в пределах одного сервера;
+# для нескольких серверов нужен Redis или Memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'BLOGICUM_CACHE_DIR', str(BASE_DIR / 'cache')
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+}
+
+PAGE_CACHE_TIMEOUT = 60 * 15
+
+# Асинхронные представления ленты, категорий, профиля и поста.
+# Включаются в blogicum/asgi.py; под WSGI остаются синхронные.
+ASYNC_VIEWS = os.environ.get('BLOGICUM_ASYNC_VIEWS') == '1'
+
+# Поток событий комментариев: сколько сообщений ждёт отправки клиенту,
+# прежде чем медленный клиент будет отключён.
+SSE_CLIENT_BUFFER = 64
+
+SSE_KEEPALIVE = 15
+
+SSE_RETRY_MS = 5000
+
 MEDIA_ROOT = BASE_DIR / 'media'
 
+MEDIA_URL = '/media/'
+
+# Заголовок, через который файл отдаёт обратный прокси:
+# 'X-Accel-Redirect' (nginx) или 'X-Sendfile' (Apache, lighttpd).
+MEDIA_SENDFILE_HEADER = None
+
+# Внутренний location nginx, указывающий на MEDIA_ROOT.
+MEDIA_SENDFILE_ROOT = '/protected-media/'
+
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+POST_IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+
+POST_IMAGE_MAX_BYTES = 10 * 1024 * 1024
+
+POST_IMAGE_MAX_SIDE = 8000
+
+POST_IMAGE_MAX_PIXELS = 40 * 10 ** 6
+
+POST_IMAGE_FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+
+# Сколько секунд после последней записи файл изображения не удаляется:
+# повторная загрузка того же файла может быть ещё не закоммичена.
+POST_IMAGE_RELEASE_DELAY = 60 * 15
+
+TASK_MAX_ATTEMPTS = 3
+
+TASK_RETRY_DELAY = 60
+
+# Через сколько секунд выполняющаяся задача считается брошенной
+# и возвращается в очередь.
+TASK_LEASE_TIMEOUT = 60 * 15
+
 TIME_ZONE = 'Europe/Moscow'
 
 USE_I18N = True
@@ -1,10 +1,11 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
 from django.views.generic.edit import CreateView
 from django.urls import include, path, reverse_lazy
 
+from core.views import serve_media
+
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
@@ -12,6 +13,7 @@ handler500 = 'pages.views.server_error'
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('blog.urls', namespace='blog')),
+    path('api/v1/', include('blog.api_urls', namespace='api_v1')),
     path('auth/', include('django.contrib.auth.urls')),
     path('auth/registration/',
          CreateView.as_view(
@@ -21,4 +23,6 @@ urlpatterns = [
          ),
          name='registration'),
     path('pages/', include('pages.urls', namespace='pages')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path(f'{settings.MEDIA_URL.lstrip("/")}<path:path>', serve_media,
+         name='media'),
+]
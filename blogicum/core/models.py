@@ -4,7 +4,8 @@ from django.db import models
 class PublishedModel(models.Model):
     """
     Абстрактная модель.
-    Добавляет флаг is_published и дату создания объекта created_at.
+    Добавляет флаг is_published, дату создания объекта created_at
+    и дату последнего изменения updated_at.
     """
     is_published = models.BooleanField(
         default=True,
@@ -15,6 +16,10 @@ class PublishedModel(models.Model):
         auto_now_add=True,
         verbose_name='Добавлено'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
 
     class Meta:
         abstract = True
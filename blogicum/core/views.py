@@ -0,0 +1,159 @@
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Имена файлов ContentHashStorage: <каталог>/ab/abcdef….<расширение>.
+HASHED_NAME_RE = re.compile(r'(?:^|/)([0-9a-f]{2})/(\1[0-9a-f]{62})\.\w+$')
+
+
+class RangeFile:
+    """
+    Файл, из которого читается только диапазон байт [start, start+length).
+    Метод fileno() позволяет WSGI-серверу отдать диапазон через sendfile:
+    сервер берёт смещение из позиции файла, а длину из Content-Length.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Возвращает (start, end) для заголовка Range с одним диапазоном
+    или None, если заголовок не поддерживается и нужно отдать файл
+    целиком. Для недостижимого диапазона выбрасывает ValueError.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def _range_applies(request, etag, last_modified):
+    """Диапазон отдаётся, только если If-Range совпадает с файлом."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _sendfile_response(path, fullpath):
+    response = HttpResponse()
+    if settings.MEDIA_SENDFILE_HEADER == 'X-Accel-Redirect':
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_SENDFILE_ROOT + quote(path)
+        )
+    else:
+        response[settings.MEDIA_SENDFILE_HEADER] = str(fullpath)
+    del response['Content-Type']
+    return response
+
+
+def _file_response(request, fullpath, size, etag, last_modified):
+    content_type, encoding = mimetypes.guess_type(str(fullpath))
+    content_type = content_type or 'application/octet-stream'
+    try:
+        byte_range = None
+        if _range_applies(request, etag, last_modified):
+            byte_range = parse_range(request.META.get('HTTP_RANGE', ''), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    file = fullpath.open('rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            RangeFile(file, start, end - start + 1),
+            content_type=content_type,
+            status=206
+        )
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _etag(path, stat):
+    """
+    Содержимое файла с хешем в имени не меняется, поэтому ETag берётся
+    из имени и не зависит от mtime. Остальным файлам — mtime и размер.
+    """
+    match = HASHED_NAME_RE.search(path)
+    if match:
+        return f'"{match[2]}"'
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Отдаёт файлы из MEDIA_ROOT.
+    Поддерживает условные запросы и один диапазон байт. Если задан
+    MEDIA_SENDFILE_HEADER, передачу файла выполняет обратный прокси,
+    иначе файл отдаётся FileResponse без чтения в память.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    try:
+        stat = fullpath.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404
+    if not fullpath.is_file():
+        raise Http404
+    etag = _etag(path, stat)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        if settings.MEDIA_SENDFILE_HEADER:
+            response = _sendfile_response(path, fullpath)
+        else:
+            response = _file_response(request, fullpath, stat.st_size,
+                                      etag, last_modified)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = (
+        f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable'
+    )
+    return response
@@ -34,6 +34,15 @@ class PostModelAdapter(StudentModelAdapter):
             "category",
             "location",
             "refresh_from_db",
+            "comment_count",
+            "image_variants",
+            "excerpt",
+            "text_html",
+            "image_width",
+            "image_height",
+            "image_size",
+            "image_format",
+            "updated_at",
         ]
 
     @property
@@ -3,6 +3,7 @@ import re
 import time
 from http import HTTPStatus
 from inspect import getsource
+from io import BytesIO, StringIO
 from pathlib import Path
 from typing import (
     Iterable,
@@ -19,16 +20,19 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
 from mixer.backend.django import mixer as _mixer
+from PIL import Image
 
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
 COMMENT_TEXT_DISPLAY_LEN_FOR_TESTS = 50
+IMAGE_EXTENSIONS = {"JPEG": "jpg", "MPO": "jpg"}
 
 KeyVal = NamedTuple("KeyVal", [("key", Optional[str]), ("val", Optional[str])])
 UrlRepr = NamedTuple("UrlRepr", [("url", str), ("repr", str)])
@@ -41,6 +45,65 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    from django.conf import settings
+
+    caches = {
+        alias: dict(config) for alias, config in settings.CACHES.items()
+    }
+    caches["default"]["LOCATION"] = str(tmp_path_factory.mktemp("cache"))
+    with override_settings(CACHES=caches):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import caches
+
+    for cache in caches.all():
+        cache.clear()
+    yield
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def image_file():
+    """
+    Фабрика загружаемых изображений: image_file("JPEG", (1500, 1000)).
+    Одинаковые параметры дают файлы с одинаковым содержимым.
+    """
+
+    def make(image_format="PNG", size=(40, 30), color="lightskyblue",
+             name=None, **options):
+        buffer = BytesIO()
+        Image.new("RGB", size, color).save(buffer, image_format, **options)
+        if name is None:
+            extension = IMAGE_EXTENSIONS.get(image_format, image_format)
+            name = f"photo.{extension.lower()}"
+        return SimpleUploadedFile(name, buffer.getvalue())
+
+    return make
+
+
+@pytest.fixture
+def process_tasks():
+    """Выполняет готовые задачи очереди в текущем процессе."""
+    from django.core.management import call_command
+
+    def process():
+        call_command(
+            "process_tasks", "--once", "--workers", "0", stdout=StringIO()
+        )
+
+    return process
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,108 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_list_embeds_related_objects(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    data = client.get("/api/v1/posts/").json()
+    assert [item["id"] for item in data["results"]] == [post.pk]
+    item = data["results"][0]
+    assert item["title"] == post.title
+    assert item["author"]["username"] == post.author.username
+    assert item["category"]["slug"] == post.category.slug
+    assert item["location"]["name"] == post.location.name
+    assert "text" not in item, (
+        "Убедитесь, что в списке постов по умолчанию нет полного текста."
+    )
+
+
+def test_post_list_hides_unpublished(
+        client, posts_with_unpublished_category, future_posts
+):
+    assert client.get("/api/v1/posts/").json()["results"] == [], (
+        "Убедитесь, что API применяет те же правила видимости, что и"
+        " главная страница."
+    )
+
+
+def test_sparse_fieldsets(client, post_with_published_location):
+    data = client.get(
+        "/api/v1/posts/?fields=id,title,author&fields[author]=username"
+    ).json()
+    assert data["results"][0] == {
+        "id": post_with_published_location.pk,
+        "title": post_with_published_location.title,
+        "author": {
+            "username": post_with_published_location.author.username
+        },
+    }
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get("/api/v1/posts/?fields=password")
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_cursor_pagination(client, many_posts_with_published_locations):
+    first = client.get("/api/v1/posts/?limit=5&fields=id").json()
+    assert len(first["results"]) == 5
+    second = client.get(first["next"]).json()
+    first_ids = {item["id"] for item in first["results"]}
+    assert first_ids.isdisjoint(item["id"] for item in second["results"])
+    assert second["previous"] is not None
+
+
+def test_post_detail_visibility(
+        client, user_client, mixer, user
+):
+    post = mixer.blend("blog.Post", author=user, is_published=False)
+    url = f"/api/v1/posts/{post.pk}/"
+    assert client.get(url).status_code == 404
+    response = user_client.get(url)
+    assert response.status_code == 200
+    assert response.json()["text"] == post.text, (
+        "Убедитесь, что автор видит неопубликованный пост в API."
+    )
+
+
+def test_post_detail_query_count(
+        client, post_with_published_location, django_assert_num_queries
+):
+    with django_assert_num_queries(1):
+        client.get(f"/api/v1/posts/{post_with_published_location.pk}/")
+
+
+def test_comment_list(client, comment_to_a_post):
+    post_id = comment_to_a_post.post_id
+    data = client.get(f"/api/v1/posts/{post_id}/comments/").json()
+    assert data["results"][0]["text"] == comment_to_a_post.text
+    assert data["results"][0]["author"]["username"] == (
+        comment_to_a_post.author.username
+    )
+
+
+def test_category_and_profile(client, post_with_published_location):
+    post = post_with_published_location
+    category = client.get(f"/api/v1/category/{post.category.slug}/").json()
+    assert category == {
+        "id": post.category.pk,
+        "title": post.category.title,
+        "slug": post.category.slug,
+        "description": post.category.description,
+    }
+    profile = client.get(f"/api/v1/profile/{post.author.username}/").json()
+    assert profile["username"] == post.author.username
+    assert "password" not in profile and "email" not in profile
+
+
+def test_unpublished_category_not_found(
+        client, posts_with_unpublished_category
+):
+    slug = posts_with_unpublished_category[0].category.slug
+    response = client.get(f"/api/v1/category/{slug}/")
+    assert response.status_code == 404
+    assert response.json()["detail"]
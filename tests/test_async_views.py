@@ -0,0 +1,71 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+
+from blog.views import IndexListView, PostDetailView
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _get(path, user=None, cookies=None):
+    request = RequestFactory().get(path)
+    request.user = user or AnonymousUser()
+    request.COOKIES.update(cookies or {})
+    return request
+
+
+def test_async_index_matches_sync_view(post_with_published_location):
+    view = async_to_sync(IndexListView.as_async_view())
+    response = view(_get("/"))
+    response.render()
+    assert response.status_code == 200
+    assert post_with_published_location.title in response.content.decode()
+
+
+def test_async_index_served_from_cache_without_queries(
+        post_with_published_location, django_assert_num_queries
+):
+    view = async_to_sync(IndexListView.as_async_view())
+    view(_get("/")).render()
+    with django_assert_num_queries(0):
+        response = view(_get("/"))
+    assert post_with_published_location.title in response.content.decode(), (
+        "Убедитесь, что асинхронное представление отдаёт закэшированную "
+        "страницу анонимному пользователю без запросов к базе."
+    )
+
+
+def test_async_index_with_session_uses_sync_view(
+        user, post_with_published_location
+):
+    view = async_to_sync(IndexListView.as_async_view())
+    cookies = {settings.SESSION_COOKIE_NAME: "session"}
+    view(_get("/", user, cookies)).render()
+    response = view(_get("/", user, cookies))
+    assert getattr(response, "context_data", None) is not None, (
+        "Убедитесь, что страницы авторизованных пользователей не берутся "
+        "из кэша."
+    )
+
+
+def test_async_post_detail(post_with_published_location):
+    post = post_with_published_location
+    view = async_to_sync(PostDetailView.as_async_view())
+    response = view(_get(f"/posts/{post.pk}/"), post_id=post.pk)
+    response.render()
+    assert post.title in response.content.decode()
+
+
+def test_file_cache_is_read_off_the_event_loop(settings):
+    view = IndexListView()
+    assert view.response_blocks_loop(), (
+        "Убедитесь, что файловый кэш не читается в цикле событий."
+    )
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+        }
+    }
+    assert not IndexListView().response_blocks_loop()
@@ -0,0 +1,99 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import FeedEntry
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize(
+    "url_template, n_queries",
+    (
+        ("/", 1),
+        ("/category/{category}/", 2),
+        ("/profile/{author}/", 2),
+    ),
+)
+def test_cards_do_not_load_deferred_fields(
+        client, mixer, another_user, many_posts_with_published_locations,
+        url_template, n_queries
+):
+    posts = many_posts_with_published_locations
+    mixer.blend("blog.Comment", post=posts[-1], author=another_user)
+    url = url_template.format(
+        category=posts[0].category.slug, author=posts[0].author.username
+    )
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert len(queries) == n_queries, (
+        f"Шаблон страницы `{url}` обращается к полям, которые не загружены"
+        " в запросе списка публикаций (см. blog.models.CARD_FIELDS)."
+        f" Выполненные запросы: {[q['sql'] for q in queries]}"
+    )
+
+
+@pytest.mark.parametrize(
+    "client_fixture, url_template",
+    (
+        ("client", "/"),
+        ("user_client", "/profile/{author}/"),
+    ),
+)
+def test_feed_query_reads_only_card_columns(
+        request, post_with_published_location, client_fixture, url_template
+):
+    client = request.getfixturevalue(client_fixture)
+    url = url_template.format(
+        author=post_with_published_location.author.username
+    )
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    list_sql = [
+        query["sql"] for query in queries
+        if 'FROM "blog_post"' in query["sql"]
+        or 'FROM "blog_feedentry"' in query["sql"]
+    ]
+    assert list_sql, f"Не найден запрос списка публикаций для `{url}`."
+    for column in ('"blog_post"."text"', '"blog_category"."description"',
+                   '"auth_user"."password"', '"auth_user"."email"'):
+        assert column not in list_sql[-1], (
+            f"Убедитесь, что запрос списка публикаций страницы `{url}`"
+            f" не загружает колонку {column}."
+        )
+
+
+def test_card_pages_do_not_read_deferred_fields(
+        client, monkeypatch, mixer, another_user,
+        many_posts_with_published_locations
+):
+    posts = many_posts_with_published_locations
+    mixer.blend("blog.Comment", post=posts[-1], author=another_user)
+
+    def fail(instance, fields=None, **kwargs):
+        raise AssertionError(
+            f"Шаблон карточки читает незагруженные поля {fields}"
+            f" объекта {type(instance).__name__}."
+        )
+
+    monkeypatch.setattr(Model, "refresh_from_db", fail)
+    for url in (
+        "/",
+        f"/category/{posts[0].category.slug}/",
+        f"/profile/{posts[0].author.username}/",
+        f"/search/?q={posts[0].title.split()[0]}",
+    ):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.context["page_obj"]) > 0, (
+            f"На странице `{url}` нет карточек публикаций."
+        )
+
+
+def test_feed_entry_post_defers_missing_fields(post_with_published_location):
+    post = FeedEntry.objects.get().as_post()
+    assert {"text", "text_html", "location_id"} <= post.get_deferred_fields()
+    assert {"email", "first_name"} <= post.author.get_deferred_fields()
+    assert "description" in post.category.get_deferred_fields()
@@ -0,0 +1,62 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count_table_queries(client, url, table):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    table_queries = [
+        query for query in queries.captured_queries
+        if f'FROM "{table}"' in query["sql"]
+    ]
+    return response, len(table_queries)
+
+
+@pytest.mark.parametrize("action", ("edit", "delete"))
+def test_post_change_page_loads_post_once(
+        user_client, post_with_published_location, action
+):
+    post = post_with_published_location
+    response, n_queries = _count_table_queries(
+        user_client, f"/posts/{post.id}/{action}/", "blog_post"
+    )
+    assert response.status_code == 200
+    assert n_queries == 1, (
+        "Убедитесь, что страница изменения публикации загружает публикацию"
+        " из базы данных один раз."
+    )
+
+
+@pytest.mark.parametrize("action", ("edit_comment", "delete_comment"))
+def test_comment_change_page_loads_comment_once(
+        mixer, user, user_client, post_with_published_location, action
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    response, n_queries = _count_table_queries(
+        user_client, f"/posts/{post.id}/{action}/{comment.id}/",
+        "blog_comment"
+    )
+    assert response.status_code == 200
+    assert n_queries == 1, (
+        "Убедитесь, что страница изменения комментария загружает комментарий"
+        " из базы данных один раз."
+    )
+
+
+def test_comment_of_another_post_not_found(
+        mixer, user, user_client, post_with_published_location,
+        post_with_another_category
+):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    url = (
+        f"/posts/{post_with_another_category.id}/edit_comment/{comment.id}/"
+    )
+    assert user_client.get(url).status_code == 404, (
+        "Убедитесь, что комментарий нельзя изменить по адресу чужого поста."
+    )
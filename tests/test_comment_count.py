@@ -0,0 +1,59 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer, post_with_published_location, another_user
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(
+        "blog.Comment", post=post, author=another_user
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что при создании комментария увеличивается счётчик"
+        " комментариев поста."
+    )
+
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при удалении комментария уменьшается счётчик"
+        " комментариев поста."
+    )
+
+    another_user.delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что счётчик комментариев уменьшается при каскадном"
+        " удалении комментариев."
+    )
+
+
+def test_post_save_keeps_comment_count(
+        mixer, post_with_published_location, another_user
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    post.title = "Новый заголовок"
+    post.save()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что сохранение поста не перезаписывает счётчик"
+        " комментариев устаревшим значением."
+    )
+
+
+def test_recount_comments_command(
+        mixer, post_with_published_location, another_user
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post, author=another_user)
+    type(post).objects.update(comment_count=42)
+    call_command("recount_comments", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 2
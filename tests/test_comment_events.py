@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+
+from blog.events import CLOSE, Broker, EventStreamRouter
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _scope(path):
+    return {
+        "type": "http", "method": "GET", "path": path, "query_string": b"",
+        "headers": [],
+    }
+
+
+async def _not_found(scope, receive, send):
+    raise AssertionError("Запрос потока событий не должен попадать в Django.")
+
+
+def test_slow_subscriber_is_disconnected():
+    async def run():
+        broker = Broker()
+        subscription = broker.subscribe("post:1", maxsize=2)
+        for number in range(3):
+            broker.publish("post:1", number)
+        await asyncio.sleep(0)
+        return [subscription.queue.get_nowait()
+                for _ in range(subscription.queue.qsize())]
+
+    assert async_to_sync(run)() == [CLOSE], (
+        "Убедитесь, что клиент с переполненным буфером отключается."
+    )
+
+
+def test_new_comment_is_streamed(
+        mixer, django_capture_on_commit_callbacks,
+        post_with_published_location
+):
+    post = post_with_published_location
+
+    def add_comment():
+        with django_capture_on_commit_callbacks(execute=True):
+            mixer.blend("blog.Comment", post=post, text="Живой комментарий")
+
+    async def run():
+        communicator = ApplicationCommunicator(
+            EventStreamRouter(_not_found), _scope(f"/posts/{post.pk}/events/")
+        )
+        await communicator.send_input({"type": "http.request", "body": b""})
+        start = await communicator.receive_output()
+        await communicator.receive_output()
+        await sync_to_async(add_comment)()
+        event = await communicator.receive_output()
+        await communicator.send_input({"type": "http.disconnect"})
+        await communicator.wait()
+        return start, event["body"].decode()
+
+    start, body = async_to_sync(run)()
+    assert start["status"] == 200
+    assert "event: created" in body
+    assert "Живой комментарий" in body, (
+        "Убедитесь, что новый комментарий отправляется подписчикам"
+        " фрагментом includes/comment.html."
+    )
+
+
+def test_hidden_post_stream_not_found(mixer, user):
+    post = mixer.blend("blog.Post", author=user, is_published=False)
+
+    async def run():
+        communicator = ApplicationCommunicator(
+            EventStreamRouter(_not_found), _scope(f"/posts/{post.pk}/events/")
+        )
+        await communicator.send_input({"type": "http.request", "body": b""})
+        return await communicator.receive_output()
+
+    assert async_to_sync(run)()["status"] == 404
+
+
+def test_events_under_wsgi_return_no_content(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    assert client.get(f"/posts/{post.pk}/events/").status_code == 204
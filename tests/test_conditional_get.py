@@ -0,0 +1,177 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Task
+from blog.tasks import regenerate_feed
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def no_page_cache(settings):
+    settings.PAGE_CACHE_TIMEOUT = 0
+
+
+def test_unchanged_feed_answers_not_modified_without_queries(
+        client, no_page_cache, post_with_published_location,
+        django_assert_num_queries
+):
+    response = client.get("/")
+    etag = response["ETag"]
+    with django_assert_num_queries(0):
+        response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что версия страницы списка строится по версиям"
+        " областей кэша, без запросов к базе."
+    )
+
+
+def test_if_modified_since(
+        client, no_page_cache, post_with_published_location
+):
+    last_modified = client.get("/")["Last-Modified"]
+    response = client.get("/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 304
+
+
+def test_cached_page_answers_not_modified_without_queries(
+        client, post_with_published_location, django_assert_num_queries
+):
+    etag = client.get("/")["ETag"]
+    with django_assert_num_queries(0):
+        response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+
+def test_comment_changes_version(
+        client, no_page_cache, mixer, another_user,
+        post_with_published_location
+):
+    url = f"/profile/{post_with_published_location.author.username}/"
+    etag = client.get(url)["ETag"]
+    mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=another_user
+    )
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что новый комментарий меняет версию страницы,"
+        " на которой показано число комментариев."
+    )
+
+
+def test_deleted_post_changes_version(
+        client, no_page_cache, post_with_published_location,
+        post_with_another_category
+):
+    etag = client.get("/")["ETag"]
+    post_with_another_category.delete()
+    assert client.get("/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_category_change_changes_version(
+        client, no_page_cache, post_with_published_location
+):
+    category = post_with_published_location.category
+    url = f"/category/{category.slug}/"
+    etag = client.get(url)["ETag"]
+    category.title = "Новое название"
+    category.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_logged_in_pages_have_no_etag(
+        user_client, post_with_published_location
+):
+    assert not user_client.get("/").has_header("ETag")
+
+
+def test_scheduled_regeneration_changes_version(
+        client, no_page_cache, post_with_published_location
+):
+    etag = client.get("/")["ETag"]
+    regenerate_feed("index")
+    assert client.get("/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    regenerate_feed("index", scheduled=True)
+    assert client.get("/", HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что публикация отложенного поста меняет версию"
+        " страниц его областей."
+    )
+
+
+def test_scheduled_post_schedules_version_change(
+        mixer, published_category
+):
+    pub_date = timezone.now() + timedelta(days=1)
+    mixer.blend(
+        "blog.Post", category=published_category, pub_date=pub_date,
+        is_published=True
+    )
+    regenerate_feed("index")
+    assert Task.objects.filter(
+        name="regenerate_feed",
+        payload={"scope": "index", "scheduled": True},
+        run_after__gt=pub_date
+    ).exists()
+
+
+def test_post_detail_answers_not_modified(
+        client, post_with_published_location, django_assert_num_queries
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    response = client.get(url)
+    etag = response["ETag"]
+    assert response.has_header("Last-Modified")
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что неизменившаяся страница поста отвечает 304"
+        " после одного запроса версии."
+    )
+
+
+def test_post_detail_version_tracks_comments(
+        client, mixer, another_user, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = client.get(url)["ETag"]
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=another_user
+    )
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    comment.text = "Исправленный текст"
+    comment.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что правка комментария меняет версию страницы поста."
+    )
+    etag = response["ETag"]
+    another_user.username = "renamed"
+    another_user.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что смена имени комментатора меняет версию"
+        " страницы поста."
+    )
+
+
+def test_post_detail_version_tracks_post_changes(
+        client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = client.get(url)["ETag"]
+    post_with_published_location.text = "Новый текст"
+    post_with_published_location.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_hidden_post_detail_has_no_etag(
+        client, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    assert not user_client.get(url).has_header("ETag")
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    assert client.get(url).status_code == 404
@@ -0,0 +1,36 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+DETAIL_QUERY_BUDGET = 2
+
+
+def test_detail_query_budget(
+        mixer, client, post_with_published_location, another_user,
+        django_assert_max_num_queries
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post, author=another_user)
+    with django_assert_max_num_queries(DETAIL_QUERY_BUDGET):
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
+    assert len(response.context["comments"]) == 5
+
+
+def test_detail_hides_unpublished_post_from_others(
+        mixer, user, user_client, another_user_client, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=False,
+    )
+    assert another_user_client.get(f"/posts/{post.id}/").status_code == 404, (
+        "Убедитесь, что снятая с публикации публикация недоступна другим"
+        " пользователям."
+    )
+    assert user_client.get(f"/posts/{post.id}/").status_code == 200, (
+        "Убедитесь, что автор может открыть свою снятую с публикации"
+        " публикацию."
+    )
@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import FeedEntry, Task
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(mixer, user, published_category, published_location):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1), image=None
+    )
+
+
+def _entry(post):
+    return FeedEntry.objects.filter(post=post).first()
+
+
+def test_entry_follows_post_and_related_changes(mixer, post, another_user):
+    entry = _entry(post)
+    assert entry is not None and entry.title == post.title, (
+        "Убедитесь, что для опубликованного поста создаётся строка ленты."
+    )
+    post.title = "Новый заголовок"
+    post.save()
+    assert _entry(post).title == "Новый заголовок"
+
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    assert _entry(post).comment_count == 1
+
+    post.location.name = "Новое место"
+    post.location.save()
+    assert _entry(post).location_name == "Новое место"
+    post.location.is_published = False
+    post.location.save()
+    assert _entry(post).location_name == ""
+
+    post.author.username = "renamed"
+    post.author.save()
+    assert _entry(post).author_username == "renamed"
+
+    post.is_published = False
+    post.save()
+    assert _entry(post) is None, (
+        "Убедитесь, что строка ленты удаляется при снятии поста"
+        " с публикации."
+    )
+
+
+def test_category_publication_updates_rows_in_bulk(
+        mixer, user, published_category
+):
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, image=None
+    )
+    category = published_category
+    category.is_published = False
+    with CaptureQueriesContext(connection) as queries:
+        category.save()
+    feed_queries = [
+        q for q in queries.captured_queries if "blog_feedentry" in q["sql"]
+    ]
+    assert not FeedEntry.objects.exists() and len(feed_queries) == 1, (
+        "Убедитесь, что строки ленты категории удаляются одним запросом."
+    )
+    category.is_published = True
+    category.save()
+    assert FeedEntry.objects.count() == 3
+    category.title = "Переименована"
+    category.save()
+    assert set(
+        FeedEntry.objects.values_list("category_title", flat=True)
+    ) == {"Переименована"}
+
+
+@pytest.mark.parametrize("n_posts", (2, 6))
+def test_author_deletion_does_not_touch_posts_one_by_one(
+        mixer, user, another_user, published_category, n_posts
+):
+    posts = mixer.cycle(n_posts).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, image=None
+    )
+    other = mixer.blend(
+        "blog.Post", author=another_user, category=published_category,
+        is_published=True, image=None
+    )
+    for post in posts:
+        mixer.blend("blog.Comment", post=post, author=another_user)
+        mixer.blend("blog.Comment", post=other, author=user)
+    Task.objects.all().delete()
+    with CaptureQueriesContext(connection) as queries:
+        user.delete()
+    assert len(queries) == 18, (
+        "Убедитесь, что удаление пользователя не обрабатывает его посты"
+        " и комментарии по одному. Выполненные запросы:"
+        f" {[q['sql'] for q in queries]}"
+    )
+    assert Task.objects.filter(name="regenerate_feeds").count() == 1
+    assert FeedEntry.objects.get().comment_count == 0
+    other.refresh_from_db()
+    assert other.comment_count == 0
+
+
+def test_scheduled_post_appears_at_pub_date(client, post):
+    post.pub_date = timezone.now() + timedelta(hours=1)
+    post.save()
+    assert _entry(post) is not None
+    assert post not in client.get("/").context["page_obj"]
+    visible_later = FeedEntry.objects.visible(
+        now=timezone.now() + timedelta(hours=2)
+    )
+    assert visible_later.filter(post=post).exists(), (
+        "Убедитесь, что отложенный пост попадает в ленту, когда наступает"
+        " время публикации."
+    )
+
+
+@pytest.mark.parametrize(
+    "url_template", ("/", "/category/{category}/", "/profile/{author}/")
+)
+def test_feed_pages_read_single_table(client, post, url_template):
+    url = url_template.format(
+        category=post.category.slug, author=post.author.username
+    )
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert [card.id for card in response.context["page_obj"]] == [post.id]
+    sql = queries[-1]["sql"]
+    assert 'FROM "blog_feedentry"' in sql and "JOIN" not in sql, (
+        f"Убедитесь, что страница `{url}` читает ленту из таблицы FeedEntry"
+        " без соединений."
+    )
+    content = response.content.decode()
+    assert post.title in content and post.location.name in content
@@ -0,0 +1,61 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_metadata_filled_on_upload(
+        media_root, image_file, post_with_published_location
+):
+    post = post_with_published_location
+    upload = image_file(size=(300, 200))
+    post.image = upload
+    post.save()
+    post.refresh_from_db()
+    assert (
+        post.image_width, post.image_height,
+        post.image_size, post.image_format
+    ) == (300, 200, upload.size, "PNG"), (
+        "Убедитесь, что размеры, формат и объём изображения сохраняются"
+        " в модели Post при загрузке."
+    )
+
+    post.image = None
+    post.save()
+    post.refresh_from_db()
+    assert post.image_width is None and post.image_format == ""
+
+
+def test_rendering_does_not_open_media(
+        media_root, image_file, client, post_with_published_location,
+        monkeypatch
+):
+    post = post_with_published_location
+    post.image = image_file(size=(300, 200))
+    post.save()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Файл изображения открыт при рендеринге.")
+
+    monkeypatch.setattr(Image, "open", fail)
+    for url in ("/", f"/posts/{post.id}/"):
+        content = client.get(url).content.decode()
+        assert 'width="300" height="200"' in content, (
+            "Убедитесь, что тег img выводит сохранённые ширину и высоту"
+            " изображения."
+        )
+
+
+def test_build_image_variants_backfills_metadata(
+        media_root, image_file, post_with_published_location
+):
+    post = post_with_published_location
+    post.image = image_file(size=(300, 200))
+    post.save()
+    type(post).objects.update(image_width=None, image_height=None)
+    call_command("build_image_variants", stdout=StringIO())
+    post.refresh_from_db()
+    assert (post.image_width, post.image_height) == (300, 200)
@@ -0,0 +1,136 @@
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post, Task
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _blend_with_image(mixer, author, category, image):
+    post = mixer.blend(
+        "blog.Post", author=author, category=category, image=None
+    )
+    post.image = image
+    post.save()
+    return post
+
+
+def test_same_content_stored_once(
+        media_root, image_file, mixer, user, published_category
+):
+    first = _blend_with_image(mixer, user, published_category, image_file())
+    second = _blend_with_image(mixer, user, published_category, image_file())
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые изображения сохраняются в один файл."
+    )
+    assert len(list(media_root.rglob("*.png"))) == 1
+    other = _blend_with_image(
+        mixer, user, published_category, image_file(color="tomato")
+    )
+    assert other.image.name != first.image.name
+
+
+def test_file_removed_with_last_reference(
+        settings, media_root, image_file, mixer, user, user_client,
+        published_category, process_tasks
+):
+    settings.POST_IMAGE_RELEASE_DELAY = 0
+    first = _blend_with_image(mixer, user, published_category, image_file())
+    second = _blend_with_image(mixer, user, published_category, image_file())
+    process_tasks()
+    path = media_root / first.image.name
+    first.refresh_from_db()
+    variant_path = media_root / first.image_variants[-1]["name"]
+    user_client.post(f"/posts/{first.id}/delete/")
+    process_tasks()
+    assert path.exists(), (
+        "Убедитесь, что файл изображения не удаляется, пока на него"
+        " ссылается другая публикация."
+    )
+    user_client.post(f"/posts/{second.id}/delete/")
+    assert path.exists(), (
+        "Убедитесь, что файл удаляется фоновой задачей, а не в запросе."
+    )
+    process_tasks()
+    assert not path.exists() and not variant_path.exists(), (
+        "Убедитесь, что файл изображения и его копии удаляются вместе"
+        " с последней ссылающейся на него публикацией."
+    )
+
+
+def test_file_released_on_change_and_cascade(
+        settings, media_root, image_file, mixer, user, published_category,
+        process_tasks
+):
+    settings.POST_IMAGE_RELEASE_DELAY = 0
+    post = _blend_with_image(mixer, user, published_category, image_file())
+    old_path = media_root / post.image.name
+    post.image = image_file(color="tomato")
+    post.save()
+    process_tasks()
+    assert not old_path.exists()
+
+    new_path = media_root / post.image.name
+    user.delete()
+    process_tasks()
+    assert not new_path.exists(), (
+        "Убедитесь, что изображения удаляются и при каскадном удалении"
+        " публикаций пользователя."
+    )
+
+
+def test_reuploaded_file_survives_release(
+        media_root, image_file, mixer, user, user_client, published_category,
+        process_tasks
+):
+    post = _blend_with_image(mixer, user, published_category, image_file())
+    path = media_root / post.image.name
+    os.utime(path, (0, 0))
+    user_client.post(f"/posts/{post.id}/delete/")
+    # Та же фотография загружена снова, но новый пост ещё не сохранён.
+    Post.image.field.storage.save("posts_images/photo.png", image_file())
+    assert path.stat().st_mtime == 0, (
+        "Убедитесь, что повторная загрузка не меняет mtime файла:"
+        " по нему строятся валидаторы при раздаче."
+    )
+    process_tasks()
+    assert path.exists(), (
+        "Убедитесь, что файл, загруженный заново, не удаляется до того,"
+        " как новый пост будет сохранён."
+    )
+    assert Task.objects.filter(
+        name="release_image", status=Task.Status.PENDING
+    ).exists()
+
+
+def test_cleanup_media_removes_orphans(
+        media_root, image_file, mixer, user, published_category, process_tasks
+):
+    post = _blend_with_image(mixer, user, published_category, image_file())
+    process_tasks()
+    post.refresh_from_db()
+    kept = [post.image.name] + [v["name"] for v in post.image_variants]
+    orphans = ["posts_images/ab/orphan.png", "posts_images/old_320w.jpg"]
+    for name in orphans:
+        (media_root / name).parent.mkdir(parents=True, exist_ok=True)
+        (media_root / name).write_bytes(b"orphan")
+    fresh = media_root / "posts_images" / "fresh.png"
+    fresh.write_bytes(b"fresh")
+    old = 0
+    for path in media_root.rglob("*.*"):
+        if path != fresh:
+            os.utime(path, (old, old))
+
+    call_command("cleanup_media", "--batch-size", "2", stdout=StringIO())
+    assert all((media_root / name).exists() for name in kept), (
+        "Убедитесь, что cleanup_media не удаляет используемые изображения"
+        " и их копии."
+    )
+    assert not any((media_root / name).exists() for name in orphans), (
+        "Убедитесь, что cleanup_media удаляет файлы, на которые не"
+        " ссылается ни одна публикация."
+    )
+    assert fresh.exists()
@@ -0,0 +1,156 @@
+import os
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from blog.management.commands.process_tasks import Command
+from blog.models import Task
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_variants_built_by_worker(
+        media_root, image_file, client, post_with_published_location,
+        process_tasks
+):
+    post = post_with_published_location
+    post.image = image_file("JPEG", (1500, 1000))
+    post.save()
+    post.refresh_from_db()
+    assert post.image_variants == [], (
+        "Убедитесь, что копии изображения строятся в фоновой задаче,"
+        " а не при сохранении поста."
+    )
+    content = client.get("/").content.decode()
+    assert post.image.url in content and "srcset=" not in content, (
+        "Убедитесь, что до готовности копий показывается оригинал."
+    )
+
+    process_tasks()
+    post.refresh_from_db()
+    widths = [
+        variant["width"] for variant in post.image_variants
+        if variant["format"] == "JPEG"
+    ]
+    assert widths == [320, 640, 1280, 1500], (
+        "Убедитесь, что при загрузке изображения создаются копии шириной"
+        " 320, 640 и 1280 пикселей."
+    )
+    for variant in post.image_variants:
+        assert (media_root / variant["name"]).exists()
+        with Image.open(media_root / variant["name"]) as image:
+            assert image.width == variant["width"]
+    assert not Task.objects.filter(name="process_post_image").exclude(
+        status=Task.Status.DONE
+    ).exists()
+
+    webp_widths = [
+        variant["width"] for variant in post.image_variants
+        if variant["format"] == "WEBP"
+    ]
+    assert webp_widths == [320, 640, 1280, 1500], (
+        "Убедитесь, что для изображения создаются копии в формате WebP."
+    )
+    for variant in post.image_variants:
+        with Image.open(media_root / variant["name"]) as image:
+            assert image.format == variant["format"]
+
+    content = client.get("/").content.decode()
+    assert "srcset=" in content and "320w" in content, (
+        "Убедитесь, что карточка публикации выводит srcset из копий"
+        " изображения."
+    )
+    assert '<source type="image/webp"' in content, (
+        "Убедитесь, что карточка публикации предлагает браузеру WebP-копии"
+        " через <picture>."
+    )
+    assert f'href="{post.image.url}"' in content, (
+        "Убедитесь, что ссылка на полноразмерное изображение ведёт"
+        " на оригинал."
+    )
+
+
+def test_variants_rebuilt_when_image_changes(
+        media_root, image_file, post_with_published_location, process_tasks
+):
+    post = post_with_published_location
+    post.image = image_file("JPEG", (1500, 1000))
+    post.save()
+    process_tasks()
+    post.image = image_file("JPEG", (500, 400))
+    post.save()
+    post.refresh_from_db()
+    assert post.image_variants == []
+    process_tasks()
+    post.refresh_from_db()
+    assert [
+        v["width"] for v in post.image_variants if v["format"] == "JPEG"
+    ] == [320, 500]
+
+
+def test_failed_task_is_retried_then_marked_failed(settings, process_tasks):
+    settings.TASK_MAX_ATTEMPTS = 2
+    settings.TASK_RETRY_DELAY = 0
+    task = Task.objects.create(name="process_post_image", payload={})
+    process_tasks()
+    task.refresh_from_db()
+    assert task.status == Task.Status.FAILED, (
+        "Убедитесь, что задача получает статус ошибки после исчерпания"
+        " попыток."
+    )
+    assert task.attempts == 2
+    assert "TypeError" in task.last_error
+
+
+def test_stale_running_task_is_reclaimed(settings, process_tasks):
+    settings.TASK_LEASE_TIMEOUT = 60
+    task = Task.objects.create(
+        name="process_post_image", payload={}, status=Task.Status.RUNNING,
+        attempts=1, started_at=timezone.now() - timedelta(minutes=5)
+    )
+    running = Task.objects.create(
+        name="process_post_image", payload={}, status=Task.Status.RUNNING,
+        attempts=1, started_at=timezone.now()
+    )
+    process_tasks()
+    task.refresh_from_db()
+    running.refresh_from_db()
+    assert task.attempts == 2, (
+        "Убедитесь, что задача, воркер которой пропал, возвращается"
+        " в очередь после TASK_LEASE_TIMEOUT."
+    )
+    assert running.status == Task.Status.RUNNING
+    assert list(Task.objects.retryable()) == [task]
+
+
+def test_broken_pool_is_replaced():
+    task = Task.objects.create(
+        name="process_post_image", payload={}, status=Task.Status.RUNNING,
+        attempts=1, started_at=timezone.now()
+    )
+    command = Command()
+    executor = command.create_executor(1)
+    running = {executor.submit(os._exit, 1): task.pk}
+    executor = command.restart_executor(executor, running, 1)
+    try:
+        assert executor.submit(abs, -1).result(timeout=30) == 1
+    finally:
+        executor.shutdown()
+    task.refresh_from_db()
+    assert task.status == Task.Status.PENDING
+    assert "BrokenProcessPool" in task.last_error
+
+
+def test_build_image_variants_command(
+        media_root, image_file, post_with_published_location
+):
+    post = post_with_published_location
+    post.image = image_file("JPEG", (1500, 1000))
+    post.save()
+    call_command("build_image_variants", stdout=StringIO())
+    post.refresh_from_db()
+    assert len(post.image_variants) == 8
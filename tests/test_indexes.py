@@ -0,0 +1,79 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _list_query_plan(client, url, table):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    list_sql = [
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+        and "LIMIT" in query["sql"]
+    ]
+    assert list_sql, f"Не найден запрос списка публикаций для `{url}`."
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {list_sql[-1]}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def _assert_uses_index(plan, url, table, index_name):
+    table_steps = [step for step in plan if table in step]
+    assert any(index_name in step for step in table_steps), (
+        f"Убедитесь, что запрос страницы `{url}` использует индекс"
+        f" `{index_name}`. План запроса: {plan}"
+    )
+    assert not any(step.startswith(f"SCAN {table}")
+                   and "INDEX" not in step
+                   for step in table_steps), (
+        f"Запрос страницы `{url}` выполняет полный просмотр таблицы"
+        f" `{table}`. План запроса: {plan}"
+    )
+    assert not any("TEMP B-TREE" in step for step in plan), (
+        f"Запрос страницы `{url}` сортирует публикации без индекса."
+        f" План запроса: {plan}"
+    )
+
+
+@pytest.mark.parametrize(
+    "url_template, index_name",
+    (
+        ("/", "feed_entry_idx"),
+        ("/category/{category}/", "feed_entry_category_idx"),
+        ("/profile/{author}/", "feed_entry_author_idx"),
+    ),
+)
+def test_feed_queries_use_indexes(
+        client, many_posts_with_published_locations, url_template, index_name
+):
+    post = many_posts_with_published_locations[0]
+    url = url_template.format(
+        category=post.category.slug, author=post.author.username
+    )
+    plan = _list_query_plan(client, url, "blog_feedentry")
+    _assert_uses_index(plan, url, "blog_feedentry", index_name)
+
+
+@pytest.mark.parametrize(
+    "url_template, index_name",
+    (
+        ("/profile/{author}/", "post_author_feed_idx"),
+        ("/api/v1/posts/", "post_published_feed_idx"),
+        ("/api/v1/category/{category}/posts/", "post_category_feed_idx"),
+        ("/api/v1/profile/{author}/posts/", "post_author_feed_idx"),
+    ),
+)
+def test_post_queries_use_indexes(
+        user_client, many_posts_with_published_locations, url_template,
+        index_name
+):
+    post = many_posts_with_published_locations[0]
+    url = url_template.format(
+        category=post.category.slug, author=post.author.username
+    )
+    plan = _list_query_plan(user_client, url, "blog_post")
+    _assert_uses_index(plan, url, "blog_post", index_name)
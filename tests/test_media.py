@@ -0,0 +1,94 @@
+import os
+
+import pytest
+from django.utils.http import http_date
+
+pytestmark = [pytest.mark.django_db]
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / "posts_images").mkdir()
+    path = tmp_path / "posts_images" / "photo.jpg"
+    path.write_bytes(CONTENT)
+    return path
+
+
+URL = "/media/posts_images/photo.jpg"
+
+
+def test_full_file_with_validators(client, media_file):
+    response = client.get(URL)
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == CONTENT
+    assert response["Accept-Ranges"] == "bytes"
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что медиафайлы отдаются с долгосрочным кэшированием."
+    )
+    assert client.get("/media/posts_images/missing.jpg").status_code == 404
+    assert client.post(URL).status_code == 405
+
+
+@pytest.mark.parametrize(
+    "header, start, end",
+    (("bytes=10-19", 10, 19), ("bytes=1000-", 1000, 1023),
+     ("bytes=-24", 1000, 1023), ("bytes=1020-5000", 1020, 1023)),
+)
+def test_byte_range(client, media_file, header, start, end):
+    response = client.get(URL, HTTP_RANGE=header)
+    assert response.status_code == 206, (
+        "Убедитесь, что медиафайлы поддерживают запросы диапазона байт."
+    )
+    assert b"".join(response.streaming_content) == CONTENT[start:end + 1]
+    assert response["Content-Range"] == f"bytes {start}-{end}/1024"
+    assert response["Content-Length"] == str(end - start + 1)
+
+
+def test_unsatisfiable_and_stale_range(client, media_file):
+    response = client.get(URL, HTTP_RANGE="bytes=2000-")
+    assert response.status_code == 416
+    assert response["Content-Range"] == "bytes */1024"
+    response = client.get(URL, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"old"')
+    assert response.status_code == 200
+
+
+def test_conditional_get(client, media_file):
+    response = client.get(URL)
+    etag = response["ETag"]
+    assert client.get(URL, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert client.get(
+        URL, HTTP_IF_MODIFIED_SINCE=http_date(media_file.stat().st_mtime + 1)
+    ).status_code == 304, (
+        "Убедитесь, что медиафайлы поддерживают If-Modified-Since."
+    )
+
+
+@pytest.mark.parametrize(
+    "header, value",
+    (("X-Accel-Redirect", "/protected-media/posts_images/photo.jpg"),
+     ("X-Sendfile", None)),
+)
+def test_sendfile_offload(client, media_file, settings, header, value):
+    settings.MEDIA_SENDFILE_HEADER = header
+    response = client.get(URL)
+    assert response.status_code == 200
+    assert response[header] == (value or str(media_file))
+    assert response.content == b""
+
+
+def test_hashed_name_etag_ignores_mtime(client, media_file):
+    digest = "ab" + "0" * 62
+    path = media_file.parent / "ab" / f"{digest}.jpg"
+    path.parent.mkdir()
+    path.write_bytes(CONTENT)
+    url = f"/media/posts_images/ab/{digest}.jpg"
+    etag = client.get(url)["ETag"]
+    os.utime(path, (0, 0))
+    assert client.get(url)["ETag"] == etag == f'"{digest}"', (
+        "Убедитесь, что ETag файла с хешем содержимого в имени"
+        " строится из имени, а не из mtime."
+    )
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
@@ -0,0 +1,70 @@
+import pytest
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_page_served_from_cache(
+        client, post_with_published_location, django_assert_num_queries
+):
+    assert client.get("/").status_code == 200
+    with django_assert_num_queries(0):
+        response = client.get("/")
+    assert response.status_code == 200
+    assert post_with_published_location.title in response.content.decode()
+
+
+def test_post_change_invalidates_feed(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    post.title = "Заголовок после изменения"
+    post.save()
+    content = client.get("/").content.decode()
+    assert "Заголовок после изменения" in content, (
+        "Убедитесь, что изменение публикации сбрасывает кэш главной"
+        " страницы."
+    )
+
+
+def test_page_cache_is_shared_between_processes():
+    assert not isinstance(caches["default"], LocMemCache), (
+        "Убедитесь, что кэш по умолчанию общий для процессов сайта и"
+        " воркера: иначе сброс кэша виден только в одном процессе."
+    )
+
+
+def test_invalidation_is_scoped_to_category(
+        client, post_with_published_location, post_with_another_category,
+        django_assert_num_queries
+):
+    other_category_url = (
+        f"/category/{post_with_another_category.category.slug}/"
+    )
+    client.get(other_category_url)
+    post_with_published_location.title = "Другой заголовок"
+    post_with_published_location.save()
+    with django_assert_num_queries(0):
+        client.get(other_category_url)
+
+
+def test_comment_invalidates_author_page(
+        mixer, client, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/profile/{post.author.username}/"
+    client.get(url)
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    assert "Комментарии (1)" in client.get(url).content.decode()
+
+
+def test_logged_in_pages_not_cached(
+        user_client, post_with_published_location
+):
+    user_client.get("/")
+    response = user_client.get("/")
+    assert response.context is not None, (
+        "Убедитесь, что страницы авторизованных пользователей не кэшируются."
+    )
@@ -0,0 +1,93 @@
+import base64
+
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _page(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return response.context["page_obj"]
+
+
+def test_cursor_pagination_walks_feed(
+        user_client, many_posts_with_published_locations
+):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    first_page = _page(user_client, "/")
+    assert [post.id for post in first_page] == [
+        post.id for post in expected[:N_PER_PAGE]
+    ], (
+        "Убедитесь, что первая страница курсорной пагинации содержит самые"
+        " новые публикации."
+    )
+    assert first_page.has_next() and not first_page.has_previous()
+
+    second_page = _page(user_client, f"/?cursor={first_page.next_cursor}")
+    assert [post.id for post in second_page] == [
+        post.id for post in expected[N_PER_PAGE:]
+    ], (
+        "Убедитесь, что переход по курсору «Старее» возвращает следующие"
+        " публикации без пропусков и повторов."
+    )
+    assert second_page.has_previous() and not second_page.has_next()
+
+    back_page = _page(user_client, f"/?cursor={second_page.previous_cursor}")
+    assert [post.id for post in back_page] == [
+        post.id for post in first_page
+    ], (
+        "Убедитесь, что переход по курсору «Новее» возвращает предыдущую"
+        " страницу."
+    )
+
+
+def test_invalid_cursor_returns_404(user_client):
+    response = user_client.get("/?cursor=not-a-cursor")
+    assert response.status_code == 404, (
+        "Убедитесь, что при повреждённом курсоре возвращается статус 404."
+    )
+
+
+def _cursor(raw):
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def test_stale_cursor_links_back(
+        user_client, many_posts_with_published_locations
+):
+    page = _page(
+        user_client, f"/?cursor={_cursor('a|1970-01-01T00:00:00+00:00|1')}"
+    )
+    assert not page.object_list and not page.has_next()
+    back_page = _page(user_client, f"/?cursor={page.previous_cursor}")
+    assert [post.id for post in back_page], (
+        "Убедитесь, что с пустой страницы по устаревшему курсору можно"
+        " вернуться к публикациям."
+    )
+
+
+@pytest.mark.parametrize(
+    "raw", ("a|2020-01-01T00:00:00+00:00|99999999999999999999999", "c|x|1")
+)
+def test_out_of_range_cursor_returns_404(user_client, raw):
+    response = user_client.get(f"/?cursor={_cursor(raw)}")
+    assert response.status_code == 404
+
+
+@override_settings(PAGINATION_MODE="offset")
+def test_offset_pagination_mode(
+        user_client, many_posts_with_published_locations
+):
+    page = _page(user_client, "/?page=2")
+    assert page.number == 2
+    assert len(page) == N_PER_PAGE
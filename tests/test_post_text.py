@@ -0,0 +1,52 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_text_rendered_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = (
+        "<b>раз</b>\nдва три четыре пять шесть семь восемь девять десять"
+        " одиннадцать"
+    )
+    post.save()
+    post.refresh_from_db()
+    assert post.text_html == (
+        "&lt;b&gt;раз&lt;/b&gt;<br>два три четыре пять шесть семь восемь"
+        " девять десять одиннадцать"
+    ), "Убедитесь, что HTML текста поста экранируется при сохранении."
+    assert post.excerpt.endswith("десять …"), (
+        "Убедитесь, что анонс поста обрезается до десяти слов."
+    )
+
+
+@pytest.mark.parametrize(
+    "client_fixture, url_template",
+    (
+        ("client", "/"),
+        ("user_client", "/profile/{author}/"),
+    ),
+)
+def test_feed_does_not_load_full_text(
+        request, post_with_published_location, client_fixture, url_template
+):
+    client = request.getfixturevalue(client_fixture)
+    response = client.get(url_template.format(
+        author=post_with_published_location.author.username
+    ))
+    post = response.context["page_obj"][0]
+    assert not post.__dict__.get("text"), (
+        "Убедитесь, что на страницах со списком публикаций не загружается"
+        " полный текст."
+    )
+
+
+def test_render_post_text_command(post_with_published_location):
+    post = post_with_published_location
+    type(post).objects.update(excerpt="", text_html="")
+    call_command("render_post_text", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.excerpt and post.text_html
@@ -0,0 +1,41 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_cutoff_is_rounded_to_granularity():
+    from blog.models import publication_cutoff
+
+    now = timezone.now().replace(second=42, microsecond=123)
+    with override_settings(PUBLICATION_TIME_GRANULARITY=60):
+        assert publication_cutoff(now) == now.replace(second=0, microsecond=0)
+    with override_settings(PUBLICATION_TIME_GRANULARITY=0):
+        assert publication_cutoff(now) == now
+
+
+def test_scheduled_post_appears_without_restart(
+        mixer, user, published_category, client
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(minutes=5),
+    )
+    response = client.get("/")
+    assert post not in response.context["page_obj"], (
+        "Убедитесь, что отложенная публикация не видна до даты публикации."
+    )
+
+    later = timezone.now() + timedelta(minutes=10)
+    with mock.patch("django.utils.timezone.now", return_value=later):
+        response = client.get("/")
+    assert post in response.context["page_obj"], (
+        "Убедитесь, что отложенная публикация появляется на главной странице"
+        " после наступления даты публикации без перезапуска сервера."
+    )
@@ -0,0 +1,96 @@
+import base64
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    def blend(title, text, is_published=True):
+        return mixer.blend(
+            "blog.Post", title=title, text=text, author=user,
+            category=published_category, is_published=is_published,
+            pub_date=timezone.now() - timedelta(days=1), image=None
+        )
+
+    return {
+        "title": blend("Котики на крыше", "Весна пришла."),
+        "text": blend("Прогулка", "Видели кота <b>и</b> собаку."),
+        "other": blend("Дождь", "Ничего интересного."),
+        "hidden": blend("Кот-невидимка", "Кот", is_published=False),
+    }
+
+
+def test_search_ranks_and_highlights(client, posts):
+    response = client.get("/search/", {"q": "кот"})
+    assert response.status_code == 200
+    found = list(response.context["page_obj"])
+    assert found == [posts["title"], posts["text"]], (
+        "Убедитесь, что поиск находит опубликованные посты по заголовку и"
+        " тексту и ставит совпадения в заголовке выше."
+    )
+    content = response.content.decode()
+    assert "<mark>кота</mark>" in content, (
+        "Убедитесь, что в результатах поиска совпадения выделены."
+    )
+    assert "&lt;b&gt;и&lt;/b&gt;" in content, (
+        "Убедитесь, что текст фрагмента экранируется."
+    )
+
+
+def test_search_index_follows_changes(client, posts):
+    post = posts["other"]
+    post.text = "Теперь про кота."
+    post.save()
+    posts["title"].delete()
+    found = list(client.get("/search/", {"q": "кот"}).context["page_obj"])
+    assert found == [posts["text"], post] or found == [post, posts["text"]]
+
+
+@pytest.mark.parametrize("query", ("", '"', "AND OR *", "кот)"))
+def test_search_handles_any_input(client, posts, query):
+    assert client.get("/search/", {"q": query}).status_code == 200
+
+
+def test_search_cursor_pagination(client, settings, mixer, user,
+                                  published_category):
+    settings.PAGE_SIZE = 2
+    for number in range(5):
+        mixer.blend(
+            "blog.Post", title=f"Кот {number}", text="кот " * number,
+            author=user, category=published_category, is_published=True,
+            pub_date=timezone.now() - timedelta(days=1), image=None
+        )
+    response = client.get("/search/", {"q": "кот"})
+    seen = [post.pk for post in response.context["page_obj"]]
+    while response.context["page_obj"].has_next():
+        response = client.get("/search/", {
+            "q": "кот", "cursor": response.context["page_obj"].next_cursor
+        })
+        seen += [post.pk for post in response.context["page_obj"]]
+    assert sorted(seen) == sorted(Post.objects.values_list("pk", flat=True))
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.parametrize("value", ("nan", "inf", "1e999"))
+def test_search_rejects_non_finite_cursor(client, value):
+    cursor = base64.urlsafe_b64encode(f"a|{value}|1".encode()).decode()
+    response = client.get("/search/", {"q": "кот", "cursor": cursor})
+    assert response.status_code == 404
+
+
+def test_admin_search_uses_index(client, posts):
+    admin = get_user_model().objects.create_superuser(
+        "admin", "admin@example.com", "password"
+    )
+    client.force_login(admin)
+    response = client.get("/admin/blog/post/", {"q": "собаку"})
+    assert list(response.context["cl"].result_list) == [posts["text"]], (
+        "Убедитесь, что поиск в админке ищет и по тексту публикаций."
+    )
@@ -0,0 +1,104 @@
+import gzip
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import FeedSnapshot, Task
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def test_feed_lists_published_posts(
+        client, post_with_published_location, posts_with_unpublished_category
+):
+    response = client.get("/feed/")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("application/rss+xml")
+    content = response.content.decode()
+    assert post_with_published_location.title in content
+    for post in posts_with_unpublished_category:
+        assert post.title not in content, (
+            "Убедитесь, что RSS-лента показывает только опубликованные посты."
+        )
+
+
+def test_feed_is_served_compressed_and_conditionally(
+        client, post_with_published_location
+):
+    response = client.get("/feed/", HTTP_ACCEPT_ENCODING="gzip")
+    assert response["Content-Encoding"] == "gzip"
+    assert post_with_published_location.title in gzip.decompress(
+        response.content
+    ).decode()
+    response = client.get("/feed/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304
+
+
+def test_feed_is_regenerated_by_task_not_request(
+        client, post_with_published_location, process_tasks
+):
+    post = post_with_published_location
+    url = f"/category/{post.category.slug}/feed/"
+    client.get(url)
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" not in client.get(url).content.decode(), (
+        "Убедитесь, что RSS-лента не перестраивается при запросе."
+    )
+    process_tasks()
+    assert "Новый заголовок" in client.get(url).content.decode(), (
+        "Убедитесь, что изменение поста ставит в очередь сборку"
+        " RSS-ленты его категории."
+    )
+
+
+def test_comment_regenerates_author_feed(
+        client, mixer, another_user, post_with_published_location,
+        process_tasks
+):
+    post = post_with_published_location
+    url = f"/profile/{post.author.username}/feed/"
+    client.get(url)
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    process_tasks()
+    assert "<slash:comments>1</slash:comments>" in (
+        client.get(url).content.decode()
+    )
+
+
+def test_pending_regeneration_is_not_duplicated(
+        post_with_published_location
+):
+    Task.objects.all().delete()
+    for title in ("Первый", "Второй"):
+        post_with_published_location.title = title
+        post_with_published_location.save()
+    assert Task.objects.filter(name="regenerate_feeds").count() == 1
+
+
+def test_scheduled_post_schedules_regeneration(
+        mixer, published_category, process_tasks
+):
+    pub_date = timezone.now() + timedelta(days=1)
+    mixer.blend(
+        "blog.Post", category=published_category, pub_date=pub_date,
+        is_published=True
+    )
+    process_tasks()
+    assert FeedSnapshot.objects.filter(scope="index").exists()
+    assert Task.objects.filter(
+        name="regenerate_feed",
+        status=Task.Status.PENDING,
+        run_after__gt=pub_date
+    ).exists(), (
+        "Убедитесь, что лента будет перестроена, когда отложенный пост"
+        " станет опубликованным."
+    )
+
+
+def test_unpublished_category_feed_not_found(
+        client, posts_with_unpublished_category
+):
+    slug = posts_with_unpublished_category[0].category.slug
+    assert client.get(f"/category/{slug}/feed/").status_code == 404
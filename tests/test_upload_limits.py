@@ -0,0 +1,118 @@
+import pytest
+from django.test import Client
+from PIL import Image
+
+from blog.uploads import HEADER_SNIFF_BYTES, ImageLimitUploadHandler
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _post_data(category):
+    return {
+        "title": "Заголовок",
+        "text": "Текст",
+        "pub_date": "2020-01-01 10:00",
+        "category": category.id,
+    }
+
+
+def _create(user_client, category, image):
+    data = _post_data(category)
+    data["image"] = image
+    return user_client.post("/posts/create/", data=data)
+
+
+def _image_errors(response):
+    return response.context["form"].errors.get("image", [])
+
+
+@pytest.mark.parametrize(
+    "limits",
+    (
+        {"POST_IMAGE_MAX_BYTES": 100},
+        {"POST_IMAGE_MAX_SIDE": 30},
+        {"POST_IMAGE_MAX_PIXELS": 1000},
+        {"POST_IMAGE_FORMATS": ("JPEG",)},
+    ),
+)
+def test_limits_rejected(
+        settings, image_file, user_client, published_category, limits
+):
+    for name, value in limits.items():
+        setattr(settings, name, value)
+    response = _create(user_client, published_category, image_file())
+    assert response.status_code == 200 and _image_errors(response), (
+        "Убедитесь, что форма публикации отклоняет изображения, превышающие"
+        " настроенные лимиты."
+    )
+
+
+def test_image_within_limits_accepted(
+        media_root, image_file, user_client, published_category
+):
+    response = _create(user_client, published_category, image_file())
+    assert response.status_code == 302
+
+
+def test_multi_frame_jpeg_accepted(
+        media_root, image_file, user_client, published_category
+):
+    image = image_file(
+        "MPO", name="photo.jpg", save_all=True,
+        append_images=[Image.new("RGB", (40, 30))]
+    )
+    response = _create(user_client, published_category, image)
+    assert response.status_code == 302, (
+        "Убедитесь, что многокадровые JPEG с камер (MPO) принимаются"
+        " как JPEG."
+    )
+
+
+def test_limits_checked_with_csrf_enforced(
+        settings, image_file, user, published_category
+):
+    settings.POST_IMAGE_MAX_BYTES = 100
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = client.get("/posts/create/")
+    data = _post_data(published_category)
+    data["image"] = image_file()
+    data["csrfmiddlewaretoken"] = response.context["csrf_token"]
+    response = client.post("/posts/create/", data=data)
+    assert response.status_code == 200 and _image_errors(response)
+    del data["csrfmiddlewaretoken"]
+    data["image"] = image_file()
+    assert client.post("/posts/create/", data=data).status_code == 403
+
+
+def _run_handler(chunks):
+    handler = ImageLimitUploadHandler()
+    handler.handle_raw_input(None, {}, None, b"")
+    handler.new_file("image", "photo.png", "image/png", None)
+    passed = [handler.receive_data_chunk(chunk, 0) for chunk in chunks]
+    return handler, passed
+
+
+def test_handler_rejects_from_header_while_streaming(settings, image_file):
+    settings.POST_IMAGE_MAX_PIXELS = 1000
+    data = image_file(size=(2000, 2000)).read()
+    chunks = [data[:64], data[64:128], data[128:]]
+    handler, passed = _run_handler(chunks)
+    assert passed[-1] is None, (
+        "Убедитесь, что обработчик загрузки отклоняет изображение по"
+        " заголовку, не дожидаясь конца файла."
+    )
+    assert handler.file_complete(len(data)).error
+
+
+def test_handler_stops_on_size_and_passes_valid_data(settings, image_file):
+    settings.POST_IMAGE_MAX_BYTES = HEADER_SNIFF_BYTES
+    handler, passed = _run_handler([b"x" * 1024] * 300)
+    assert passed[0] == b"x" * 1024
+    assert passed[-1] is None and handler.header is None
+    assert handler.file_complete(300 * 1024).error
+
+    data = image_file().read()
+    handler, passed = _run_handler([data])
+    assert passed == [data]
+    assert handler.file_complete(len(data)) is None